@@ -0,0 +1,63 @@
+"""
+Structured (one call) vs fan-out (five calls) plan generation against the
+local fake model:
+
+    python bench_modes.py --plans 20 --delay 0.3
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from agents import AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig
+
+from cofounder import generate_plan, generate_sections
+from fake_openai import start_fake_openai
+
+IDEA = "A wearable that tracks hydration levels and syncs with a mobile app to remind users to drink water."
+
+
+async def fan_out(idea, config):
+    return {key: text async for key, text in generate_sections(idea, config)}
+
+
+async def structured(idea, config):
+    return (await generate_plan(idea, config)).model_dump()
+
+
+async def bench(label, generate, config, server, plans):
+    server.stats.clear()
+    latencies = []
+    for _ in range(plans):
+        start = time.perf_counter()
+        plan = await generate(IDEA, config)
+        latencies.append(time.perf_counter() - start)
+        assert all(plan.values()), f"{label}: a section failed"
+    stats = server.stats
+    print(f"{label:<11} requests/plan={stats['requests'] / plans:4.1f}  "
+          f"prompt tokens/plan={stats['prompt_tokens'] / plans:7.1f}  "
+          f"completion tokens/plan={stats['completion_tokens'] / plans:6.1f}  "
+          f"latency p50={statistics.median(latencies) * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--plans", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.3, help="fake model latency in seconds")
+    args = parser.parse_args()
+
+    server = start_fake_openai(args.delay)
+    client = AsyncOpenAI(api_key="fake", base_url=f"http://127.0.0.1:{server.server_port}/")
+    model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+    config = RunConfig(model=model, model_provider=client, tracing_disabled=True)
+
+    async def run_all():
+        await bench("fan-out", fan_out, config, server, args.plans)
+        await bench("structured", structured, config, server, args.plans)
+
+    asyncio.run(run_all())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
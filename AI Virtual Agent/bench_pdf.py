@@ -0,0 +1,58 @@
+"""
+Render time and peak memory of the PDF report engine on a ~50-page plan:
+
+    python bench_pdf.py --pages 50
+"""
+import argparse
+import re
+import time
+import tracemalloc
+
+import streamlit as st
+
+from pdf_report import render_pdf
+
+BULLET = "- **Point {i}**: A detailed explanation of how the product reaches customers, " \
+         "why they will pay for it, and what the team needs to build next to get there."
+
+
+def make_sections(pages: int) -> list[tuple[str, str]]:
+    # ~45 wrapped body lines fit on a page and each bullet wraps to two lines
+    bullets_per_section = max(1, pages * 22 // 5)
+    body = "\n".join(BULLET.format(i=i) for i in range(bullets_per_section))
+    return [(title, body) for title in
+            ["Refined Idea:", "Business Model:", "Target Audience:", "Pricing Strategy:", "Pitch Deck Content:"]]
+
+
+@st.cache_data(show_spinner=False)
+def cached_render(title, sections):
+    return render_pdf(title, sections)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+    sections = make_sections(args.pages)
+
+    start = time.perf_counter()
+    pdf = render_pdf("AI Startup Co-founder Report", sections)
+    elapsed = time.perf_counter() - start
+
+    # Separate run for memory: tracemalloc slows rendering down a lot
+    tracemalloc.start()
+    render_pdf("AI Startup Co-founder Report", sections)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    pages = len(re.findall(rb"/Type /Page\b(?!s)", pdf))
+    print(f"render:     {elapsed * 1000:8.1f} ms  peak={peak / 1e6:6.2f} MB  "
+          f"size={len(pdf) / 1e3:7.1f} KB  pages={pages}")
+
+    cached_render("AI Startup Co-founder Report", sections)
+    start = time.perf_counter()
+    cached_render("AI Startup Co-founder Report", sections)
+    print(f"cache hit:  {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import asyncio
+import os
+
+from agents import Agent, Runner
+from pydantic import BaseModel, Field
+
+SECTION_TIMEOUT = float(os.getenv("SECTION_TIMEOUT", "45"))  # seconds per fan-out section
+PLAN_TIMEOUT = float(os.getenv("PLAN_TIMEOUT", "90"))  # seconds for the single structured call
+
+# --- Prompts for fan-out mode (one call per section) ---
+SECTION_PROMPTS = {
+    "refined_idea": "Refine this startup idea: ",
+    "business_model": "Generate a business model for: ",
+    "target_audience": "Identify target audience for: ",
+    "pricing_strategy": "Suggest pricing strategy for: ",
+    "pitch_deck": "Create pitch deck content for: ",
+}
+
+cofounder_agent = Agent(
+    name="Startup Co-founder",
+    instructions="""You are an experienced startup co-founder. Answer in concise
+    markdown bullet points that a founder can paste into a business plan.""",
+)
+
+
+# --- Structured mode (every section from one call) ---
+class StartupPlan(BaseModel):
+    refined_idea: str = Field(description="The startup idea, refined in one or two sentences")
+    business_model: str = Field(description="Problem, solution and revenue model as markdown bullets")
+    target_audience: str = Field(description="Target customer segments as markdown bullets")
+    pricing_strategy: str = Field(description="Pricing tiers as markdown bullets")
+    pitch_deck: str = Field(description="Pitch deck slide outline as a numbered markdown list")
+
+
+plan_agent = Agent(
+    name="Startup Planner",
+    instructions="""You are an experienced startup co-founder. Turn the user's idea
+    into a complete startup plan. Keep every section concise markdown.""",
+    output_type=StartupPlan,
+)
+
+
+async def call_gemini_api(idea, prompt, config):
+    result = await asyncio.wait_for(
+        Runner.run(cofounder_agent, input=prompt + idea, run_config=config),
+        timeout=SECTION_TIMEOUT,
+    )
+    return result.final_output
+
+
+async def generate_section(key, idea, config):
+    try:
+        return key, await call_gemini_api(idea, SECTION_PROMPTS[key], config)
+    except Exception:
+        return key, None
+
+
+async def generate_sections(idea, config):
+    """
+    Fan-out mode: launch every section at once and yield (key, text) as each
+    one finishes. text is None when that section failed or timed out.
+    """
+    tasks = [asyncio.create_task(generate_section(key, idea, config)) for key in SECTION_PROMPTS]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def generate_plan(idea, config) -> StartupPlan:
+    """Structured mode: one call returns every section as a StartupPlan."""
+    result = await asyncio.wait_for(
+        Runner.run(plan_agent, input=idea, run_config=config),
+        timeout=PLAN_TIMEOUT,
+    )
+    return result.final_output
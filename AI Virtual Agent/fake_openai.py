@@ -0,0 +1,127 @@
+"""
+Minimal OpenAI-compatible /chat/completions endpoint for offline runs.
+
+Every request gets the same short answer after `delay` seconds, with a
+usage block. Requests with a JSON schema response_format get an object
+with the canned answer in every string property. The server keeps
+request/token totals in `server.stats`.
+
+    python fake_openai.py --port 8765 --delay 0.2
+    GEMINI_BASE_URL=http://127.0.0.1:8765/ GEMINI_API_KEY=fake streamlit run main.py
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPLY = "This is a canned answer from the local fake model."
+
+
+def structured_reply(request: dict) -> str | None:
+    response_format = request.get("response_format") or {}
+    if response_format.get("type") != "json_schema":
+        return None
+    properties = response_format["json_schema"]["schema"].get("properties", {})
+    return json.dumps({name: REPLY for name in properties})
+
+
+def make_handler(delay: float, token_delay: float = 0.0, stats: dict | None = None):
+    stats = stats if stats is not None else {}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            time.sleep(delay)  # simulated model latency
+            prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in request.get("messages", []))
+            reply = structured_reply(request) or REPLY
+            completion_tokens = len(reply.split())
+            with lock:
+                stats["requests"] = stats.get("requests", 0) + 1
+                stats["prompt_tokens"] = stats.get("prompt_tokens", 0) + prompt_tokens
+                stats["completion_tokens"] = stats.get("completion_tokens", 0) + completion_tokens
+            if request.get("stream"):
+                self.stream_reply(request, reply, prompt_tokens, completion_tokens)
+                return
+            body = json.dumps({
+                "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "fake"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": reply},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def stream_reply(self, request, reply, prompt_tokens, completion_tokens):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            chunk_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+            def send(delta, finish_reason=None, usage=None):
+                chunk = {
+                    "id": chunk_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": request.get("model", "fake"),
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                }
+                if usage:
+                    chunk["usage"] = usage
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+
+            for word in reply.split():
+                time.sleep(token_delay)
+                send({"content": word + " "})
+            send({}, "stop", {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            })
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_fake_openai(delay: float = 0.2, port: int = 0, token_delay: float = 0.0) -> ThreadingHTTPServer:
+    stats = {}
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(delay, token_delay, stats))
+    server.stats = stats
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--token-delay", type=float, default=0.0, help="pause between streamed words")
+    args = parser.parse_args()
+    server = start_fake_openai(args.delay, args.port, args.token_delay)
+    print(f"Fake OpenAI endpoint on http://127.0.0.1:{server.server_port}/")
+    threading.Event().wait()
@@ -2,10 +2,8 @@
 import streamlit as st
 import os
 from dotenv import load_dotenv
-import io
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
+import time
+from pdf_report import render_pdf
 
 # --- Load API Key ---
 load_dotenv()
@@ -14,29 +12,15 @@ if not gemini_api_key:
     st.error("❌ GEMINI_API_KEY environment variable is not set.")
     st.stop()
 
-# --- Agentic SDK Setup (Placeholder for Gemini API) ---
+# --- Agentic SDK Setup ---
+AGENTS_AVAILABLE = True
 try:
-    from agents import (
-        Runner,
-        Agent,
-        AsyncOpenAI,
-        OpenAIChatCompletionsModel,
-        RunConfig,
-    )
-    external_client = AsyncOpenAI(
-        api_key=gemini_api_key,
-        base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-    )
-    model = OpenAIChatCompletionsModel(
-        model="gemini-2.0-flash",
-        openai_client=external_client
-    )
-    config = RunConfig(
-        model=model,
-        model_provider=external_client,
-        tracing_disabled=True
-    )
+    from runtime import get_runtime, iter_async, run_async
+    from cofounder import generate_plan, generate_sections
+    # Client, model and config are cached across reruns
+    external_client, model, config = get_runtime(gemini_api_key, "gemini-2.0-flash")
 except ImportError:
+    AGENTS_AVAILABLE = False
     st.warning("Agentic SDK not available. Using dummy functions for demo.")
 
 # --- Streamlit Page Config ---
@@ -113,24 +97,11 @@ idea = st.text_area(
     height=150
 )
 
-# --- Gemini API Integration (Placeholder) ---
-def call_gemini_api(idea, prompt):
-    # Placeholder for actual API call
-    try:
-        # Example: Replace with actual Gemini API call
-        response = model.generate_content(prompt + idea)  # Hypothetical method
-        return response.text
-    except:
-        # Fallback to dummy response
-        return f"AI-generated response for: {idea}"
-
-# --- Improved Dummy Functions (to be replaced with Gemini API) ---
+# --- Dummy Functions (used when a section's API call fails or times out) ---
 def idea_refiner(idea):
-    # Replace with: return call_gemini_api(idea, "Refine this startup idea: ")
     return f"A refined solution: **{idea}** with AI-driven optimization."
 
 def business_model(idea):
-    # Replace with: return call_gemini_api(idea, "Generate a business model for: ")
     return f"""
     - **Problem**: Lack of efficient solutions for {idea.lower()}
     - **Solution**: AI-powered platform for {idea.lower()}
@@ -138,7 +109,6 @@ def business_model(idea):
     """
 
 def target_audience(idea):
-    # Replace with: return call_gemini_api(idea, "Identify target audience for: ")
     return f"""
     - Young professionals
     - Tech-savvy {idea.lower()} enthusiasts
@@ -146,7 +116,6 @@ def target_audience(idea):
     """
 
 def pricing_strategy(idea):
-    # Replace with: return call_gemini_api(idea, "Suggest pricing strategy for: ")
     return f"""
     - **Free Tier**: Basic features
     - **Pro Tier**: $15/month for advanced analytics
@@ -154,7 +123,6 @@ def pricing_strategy(idea):
     """
 
 def pitch_deck_content(idea):
-    # Replace with: return call_gemini_api(idea, "Create pitch deck content for: ")
     return f"""
     ### Pitch Deck Slides
     1. **Problem**: Inefficiencies in {idea.lower()}
@@ -165,84 +133,84 @@ def pitch_deck_content(idea):
     6. **Funding Ask**: $100K for MVP development
     """
 
+# --- Startup Plan Sections ---
+SECTIONS = {
+    "refined_idea": ("✅ Refined Idea", idea_refiner),
+    "business_model": ("🧱 Business Model Canvas", business_model),
+    "target_audience": ("👥 Target Audience", target_audience),
+    "pricing_strategy": ("💰 Pricing Strategy", pricing_strategy),
+    "pitch_deck": ("📊 Pitch Deck Content", pitch_deck_content),
+}
+
+def render_section(key, text):
+    if key == "pitch_deck":
+        st.markdown(text)
+    elif key == "refined_idea":
+        st.markdown(f"<div style='background:#1a3c34;padding:16px;border-radius:10px;color:#e6ffec;'>{text}</div>", unsafe_allow_html=True)
+    else:
+        st.markdown(f"<div style='background:#2a2a5e;padding:16px;border-radius:10px;color:#e0e0ff;'>{text}</div>", unsafe_allow_html=True)
+
 # --- Generate PDF Report ---
-def generate_pdf_report(idea, refined, model, audience, pricing, deck):
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
-    c.setFont("Helvetica-Bold", 16)
-    c.setFillColor(colors.cyan)
-    c.drawString(50, 750, "AI Startup Co-founder Report")
-    
-    c.setFont("Helvetica", 12)
-    c.setFillColor(colors.black)
-    y = 720
-    c.drawString(50, y, "Refined Idea:")
-    y -= 20
-    c.drawString(50, y, refined)
-    
-    y -= 40
-    c.drawString(50, y, "Business Model:")
-    for line in model.split("\n"):
-        c.drawString(50, y, line.strip())
-        y -= 20
-    
-    y -= 20
-    c.drawString(50, y, "Target Audience:")
-    for line in audience.split("\n"):
-        c.drawString(50, y, line.strip())
-        y -= 20
-    
-    y -= 20
-    c.drawString(50, y, "Pricing Strategy:")
-    for line in pricing.split("\n"):
-        c.drawString(50, y, line.strip())
-        y -= 20
-    
-    y -= 20
-    c.drawString(50, y, "Pitch Deck Content:")
-    for line in deck.split("\n")[:5]:  # Limit for brevity
-        c.drawString(50, y, line.strip())
-        y -= 20
-    
-    c.showPage()
-    c.save()
-    buffer.seek(0)
-    return buffer
+# Cached on the plan's content, so repeated downloads of the same plan don't re-render
+@st.cache_data(max_entries=32, show_spinner=False)
+def generate_pdf_report(idea, plan):
+    return render_pdf("AI Startup Co-founder Report", [
+        ("Refined Idea:", plan["refined_idea"]),
+        ("Business Model:", plan["business_model"]),
+        ("Target Audience:", plan["target_audience"]),
+        ("Pricing Strategy:", plan["pricing_strategy"]),
+        ("Pitch Deck Content:", plan["pitch_deck"]),
+    ])
+
+# --- Generation Mode ---
+mode = st.radio(
+    "Generation mode:",
+    ["⚡ Single call (structured plan)", "🔀 Fan-out (one call per section)"],
+    horizontal=True,
+)
+structured = mode.startswith("⚡")
 
 # --- Generate Button and Output ---
 if st.button("🚀 Generate Startup Plan") and idea.strip():
+    # Expanders are created up front and each one fills in as its section finishes
+    placeholders = {}
+    for key, (title, _) in SECTIONS.items():
+        with st.expander(title, expanded=(key == "refined_idea")):
+            placeholders[key] = st.empty()
+            placeholders[key].info("⏳ Generating...")
+
+    results = {}
+    start = time.perf_counter()
     with st.spinner("⏳ Crafting your AI-powered business plan..."):
-        # Generate outputs
-        refined = idea_refiner(idea)
-        model = business_model(idea)
-        audience = target_audience(idea)
-        pricing = pricing_strategy(idea)
-        deck = pitch_deck_content(idea)
-
-        # Display outputs in expanders
-        with st.expander("✅ Refined Idea", expanded=True):
-            st.markdown(f"<div style='background:#1a3c34;padding:16px;border-radius:10px;color:#e6ffec;'>{refined}</div>", unsafe_allow_html=True)
-
-        with st.expander("🧱 Business Model Canvas"):
-            st.markdown(f"<div style='background:#2a2a5e;padding:16px;border-radius:10px;color:#e0e0ff;'>{model}</div>", unsafe_allow_html=True)
-
-        with st.expander("👥 Target Audience"):
-            st.markdown(f"<div style='background:#2a2a5e;padding:16px;border-radius:10px;color:#e0e0ff;'>{audience}</div>", unsafe_allow_html=True)
-
-        with st.expander("💰 Pricing Strategy"):
-            st.markdown(f"<div style='background:#2a2a5e;padding:16px;border-radius:10px;color:#e0e0ff;'>{pricing}</div>", unsafe_allow_html=True)
-
-        with st.expander("📊 Pitch Deck Content"):
-            st.markdown(deck)
-
-        # Downloadable PDF
-        pdf_buffer = generate_pdf_report(idea, refined, model, audience, pricing, deck)
-        st.download_button(
-            label="📥 Download Business Plan PDF",
-            data=pdf_buffer,
-            file_name="startup_plan.pdf",
-            mime="application/pdf"
-        )
+        if not AGENTS_AVAILABLE:
+            finished = ((key, None) for key in SECTIONS)
+        elif structured:
+            try:
+                plan = run_async(generate_plan(idea, config))
+                finished = plan.model_dump().items()
+            except Exception:
+                finished = ((key, None) for key in SECTIONS)
+        else:
+            finished = iter_async(generate_sections(idea, config))
+
+        for key, text in finished:
+            # Failed or timed-out sections fall back to the template text
+            results[key] = text if text is not None else SECTIONS[key][1](idea)
+            with placeholders[key].container():
+                render_section(key, results[key])
+                if text is None:
+                    st.caption("⚠️ AI generation failed or timed out, showing a template instead.")
+
+    st.caption(f"⏱️ Plan generated in {time.perf_counter() - start:.1f}s")
+
+    # Downloadable PDF
+    pdf_bytes = generate_pdf_report(idea, results)
+    st.download_button(
+        label="📥 Download Business Plan PDF",
+        data=pdf_bytes,
+        file_name="startup_plan.pdf",
+        mime="application/pdf"
+    )
 
 # --- Footer ---
 st.markdown("---")
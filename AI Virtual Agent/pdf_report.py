@@ -0,0 +1,85 @@
+import io
+import re
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfgen import canvas
+
+PAGE_WIDTH, PAGE_HEIGHT = letter
+MARGIN = 50
+TEXT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+
+TITLE = ("Helvetica-Bold", 16, colors.cyan)
+HEADING = ("Helvetica-Bold", 13, colors.black)
+BODY = ("Helvetica", 11, colors.black)
+FOOTER = ("Helvetica", 9, colors.grey)
+
+
+def clean_line(line: str) -> str:
+    """Drop the markdown decoration that would print literally in the PDF."""
+    line = line.strip().replace("**", "")
+    return re.sub(r"^#+\s*", "", line)
+
+
+def layout_lines(title: str, sections: list[tuple[str, str]]):
+    """
+    Yield (style, text, space_before) one wrapped line at a time, so pages
+    can be drawn as soon as they fill up instead of after the whole plan
+    has been laid out.
+    """
+    yield TITLE, title, 0
+    for heading, body in sections:
+        yield HEADING, heading, 14
+        for paragraph in body.split("\n"):
+            paragraph = clean_line(paragraph)
+            if not paragraph:
+                continue
+            font, size, _ = BODY
+            for wrapped in simpleSplit(paragraph, font, size, TEXT_WIDTH):
+                yield BODY, wrapped, 0
+
+
+class PageWriter:
+    """Draws lines top to bottom and starts a new page when the current one is full."""
+
+    def __init__(self, c: canvas.Canvas):
+        self.c = c
+        self.page = 1
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def _finish_page(self):
+        font, size, color = FOOTER
+        self.c.setFont(font, size)
+        self.c.setFillColor(color)
+        self.c.drawRightString(PAGE_WIDTH - MARGIN, MARGIN / 2, f"Page {self.page}")
+        self.c.showPage()
+
+    def draw(self, style, text: str, space_before: float = 0):
+        font, size, color = style
+        line_height = size * 1.45
+        if self.y - space_before - line_height < MARGIN:
+            self._finish_page()
+            self.page += 1
+            self.y = PAGE_HEIGHT - MARGIN
+        elif self.y < PAGE_HEIGHT - MARGIN:
+            self.y -= space_before
+        self.y -= line_height
+        self.c.setFont(font, size)
+        self.c.setFillColor(color)
+        self.c.drawString(MARGIN, self.y, text)
+
+    def close(self):
+        self._finish_page()
+
+
+def render_pdf(title: str, sections: list[tuple[str, str]]) -> bytes:
+    """Render a wrapped, paginated report and return the PDF bytes."""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter, pageCompression=1)
+    writer = PageWriter(c)
+    for style, text, space_before in layout_lines(title, sections):
+        writer.draw(style, text, space_before)
+    writer.close()
+    c.save()
+    return buffer.getvalue()
@@ -0,0 +1,78 @@
+"""
+Rerun overhead and per-request latency, before and after the shared runtime.
+
+"before" rebuilds the client/model/config on every rerun and runs each
+request in a fresh asyncio.run() loop; "after" uses runtime.py's cached
+objects and background loop. Uses the local fake model:
+
+    python bench_runtime.py --requests 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, Runner
+
+from fake_openai import start_fake_openai
+import runtime
+
+writer = Agent(name="Writer Agent", instructions="You are a writer agent.")
+
+
+def summary(label: str, setup: list[float], latency: list[float]):
+    print(f"{label:<7} rerun setup p50={statistics.median(setup) * 1000:7.3f} ms   "
+          f"request p50={statistics.median(latency) * 1000:7.2f} ms  "
+          f"max={max(latency) * 1000:7.2f} ms")
+
+
+def before(base_url: str, n: int):
+    setup, latency = [], []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        client = AsyncOpenAI(api_key="fake", base_url=base_url)
+        model = OpenAIChatCompletionsModel(model="gemini-1.5-flash", openai_client=client)
+        config = RunConfig(model=model, model_provider=client, tracing_disabled=True)
+        setup.append(time.perf_counter() - t0)
+
+        async def request():
+            try:
+                await Runner.run(writer, input="Write a haiku", run_config=config)
+            finally:
+                await client.close()  # the pool dies with this loop anyway
+
+        t0 = time.perf_counter()
+        asyncio.run(request())
+        latency.append(time.perf_counter() - t0)
+    summary("before", setup, latency)
+
+
+def after(base_url: str, n: int):
+    setup, latency = [], []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        _, _, config = runtime.get_runtime("fake", "gemini-1.5-flash", base_url)
+        setup.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        runtime.run_async(Runner.run(writer, input="Write a haiku", run_config=config))
+        latency.append(time.perf_counter() - t0)
+    summary("after", setup, latency)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.02, help="fake model latency in seconds")
+    args = parser.parse_args()
+
+    server = start_fake_openai(args.delay)
+    base_url = f"http://127.0.0.1:{server.server_port}/"
+    before(base_url, args.requests)
+    after(base_url, args.requests)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
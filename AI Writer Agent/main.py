@@ -1,8 +1,11 @@
 import streamlit as st
-import asyncio
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig
+import time
+from agents import Agent, Runner
+from openai.types.responses import ResponseTextDeltaEvent
 from dotenv import load_dotenv
 import os
+from runtime import get_runtime, iter_async, run_async
+from response_cache import ResponseCache, cache_key
 
 # Load environment variables
 load_dotenv()
@@ -12,24 +15,8 @@ gemini_api_key = os.getenv("GEMINI_API_KEY")
 if not gemini_api_key:
     raise ValueError("GEMINI_API_KEY is not set. Please define it in your .env file.")
 
-# Setup Gemini-compatible OpenAI client
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-# Model setup
-model = OpenAIChatCompletionsModel(
-    model="gemini-1.5-flash",
-    openai_client=external_client
-)
-
-# Config
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# Client, model and config are created once per process and reused across reruns
+external_client, model, config = get_runtime(gemini_api_key, "gemini-1.5-flash")
 
 # Writer Agent
 writer = Agent(
@@ -38,6 +25,11 @@ writer = Agent(
     stories, essay, email etc."""
 )
 
+# Response cache (shared by every session in this process)
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache()
+
 # Async call
 async def run_agent(prompt: str):
     response = await Runner.run(
@@ -47,6 +39,17 @@ async def run_agent(prompt: str):
     )
     return response.final_output
 
+# Streaming call: yields text deltas as they arrive
+async def stream_agent(prompt: str):
+    result = Runner.run_streamed(
+        writer,
+        input=prompt,
+        run_config=config
+    )
+    async for event in result.stream_events():
+        if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+            yield event.data.delta
+
 # -----------------------------
 # Streamlit UI Enhancements
 # -----------------------------
@@ -90,16 +93,66 @@ st.markdown("<p style='text-align: center; color: gray;'>Generate poems, stories
 # Input
 user_input = st.text_area("Enter your prompt below:", placeholder="e.g., Write a short story about AI saving the world.", height=180)
 
-# Button
-if st.button("✍️ Generate Content"):
-    if user_input.strip() == "":
+# Options
+stream_output = st.toggle("⚡ Stream output as it is written", value=True)
+use_cache = st.toggle("💾 Reuse cached responses for repeated prompts", value=False)
+
+# Buttons
+col1, col2 = st.columns(2)
+with col1:
+    generate = st.button("✍️ Generate Content")
+with col2:
+    regenerate = use_cache and st.button("🔄 Regenerate (skip cache)")
+
+if generate or regenerate:
+    response_cache = get_response_cache() if use_cache else None
+    key = cache_key(user_input, writer.instructions, model.model)
+    has_prompt = user_input.strip() != ""
+    # Only look a prompt up once we know there is one to answer
+    cached = response_cache.get(key) if response_cache and has_prompt and not regenerate else None
+
+    if not has_prompt:
         st.warning("Please enter a prompt first.")
+    elif cached is not None:
+        st.success("✅ Done! (from cache)")
+        st.markdown("### 📄 Generated Output:")
+        with st.expander("Click to view output", expanded=True):
+            st.markdown(cached)
+    elif stream_output:
+        st.markdown("### 📄 Generated Output:")
+        with st.expander("Click to view output", expanded=True):
+            placeholder = st.empty()
+            start = time.perf_counter()
+            ttft = None
+            response = ""
+            for delta in iter_async(stream_agent(user_input)):
+                if ttft is None:
+                    ttft = time.perf_counter() - start
+                response += delta
+                placeholder.markdown(response + "▌")
+            total = time.perf_counter() - start
+            ttft = total if ttft is None else ttft
+            placeholder.markdown(response)
+        st.success("✅ Done!")
+        st.caption(f"⏱️ First token after {ttft:.2f}s · finished in {total:.2f}s")
+        if response_cache and response.strip():  # never cache an empty answer
+            response_cache.put(key, response, total)
     else:
+        start = time.perf_counter()
         with st.spinner("🌀 Generating with Gemini..."):
-            response = asyncio.run(run_agent(user_input))
+            response = run_async(run_agent(user_input))
+        total = time.perf_counter() - start
         st.success("✅ Done!")
         st.markdown("### 📄 Generated Output:")
         with st.expander("Click to view output", expanded=True):
             st.markdown(response)
+        st.caption(f"⏱️ Finished in {total:.2f}s")
+        if response_cache and response.strip():  # never cache an empty answer
+            response_cache.put(key, response, total)
+
+    if response_cache:
+        stats = response_cache.stats()
+        st.caption(f"💾 Cache hit rate {stats['hit_rate']:.0%} over {stats['lookups']} lookups · "
+                   f"{stats['seconds_saved']:.1f}s of generation saved")
 st.markdown("---")
 st.markdown("🚀 Made with ❤️ by Sikandar Tahir")    
\ No newline at end of file
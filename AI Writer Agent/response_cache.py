@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_DB = os.getenv("WRITER_CACHE_DB", "writer_cache.sqlite3")
+MEMORY_ENTRIES = int(os.getenv("WRITER_CACHE_ENTRIES", "256"))
+DISK_BYTES = int(os.getenv("WRITER_CACHE_BYTES", str(50 * 1024 * 1024)))
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case, surrounding whitespace and trailing punctuation don't change the request."""
+    return re.sub(r"\s+", " ", prompt).strip().rstrip(".!?").lower()
+
+
+def cache_key(prompt: str, instructions: str, model_name: str) -> str:
+    payload = json.dumps([normalize_prompt(prompt), instructions.strip(), model_name])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache of generated text: an in-memory LRU in front of a SQLite
+    table. The SQLite tier evicts least recently used rows once the stored
+    text exceeds `max_bytes`.
+    """
+
+    def __init__(self, path: str = CACHE_DB, max_entries: int = MEMORY_ENTRIES, max_bytes: int = DISK_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                gen_seconds REAL NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+
+    def _remember(self, key: str, value: tuple[str, float]):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                text, gen_seconds = self._memory[key]
+                self.memory_hits += 1
+                self.seconds_saved += gen_seconds
+                return text
+
+            row = self._db.execute("SELECT text, gen_seconds FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            self._remember(key, (row[0], row[1]))
+            self.disk_hits += 1
+            self.seconds_saved += row[1]
+            return row[0]
+
+    def put(self, key: str, text: str, gen_seconds: float):
+        size = len(text.encode())
+        with self._lock:
+            self._remember(key, (text, gen_seconds))
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, text, gen_seconds, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, text, gen_seconds, size, time.time()),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._memory.pop(key, None)
+            total -= size
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "lookups": lookups,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "seconds_saved": self.seconds_saved,
+        }
@@ -0,0 +1,145 @@
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from PIL import Image
+
+CACHE_DB = os.getenv("ANALYSIS_CACHE_DB", "analysis_cache.sqlite3")
+MEMORY_ENTRIES = int(os.getenv("ANALYSIS_CACHE_ENTRIES", "256"))
+DISK_BYTES = int(os.getenv("ANALYSIS_CACHE_BYTES", str(50 * 1024 * 1024)))
+
+
+def image_fingerprint(data: bytes) -> tuple[str, int]:
+    """
+    (content hash, perceptual hash) of a normalized upload.
+
+    The content hash (SHA-256 of the bytes) matches the exact same image.
+    The 64-bit difference hash compares neighbouring pixels of a 9x8
+    grayscale thumbnail, so it survives re-encoding, resizing and stripped
+    metadata. It is far too coarse to identify a photo (a hat or glasses
+    added, or two flat images of different colours, keep the same hash), so
+    it is only used to count near-duplicate uploads, never to serve results.
+    """
+    pixels = list(Image.open(io.BytesIO(data)).convert("L").resize((9, 8), Image.Resampling.BILINEAR).getdata())
+    dhash = 0
+    for row in range(8):
+        for col in range(8):
+            dhash = (dhash << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    dhash -= 1 << 63  # fit SQLite's signed 64-bit INTEGER
+    return hashlib.sha256(data).hexdigest(), dhash
+
+
+def prompt_key(prompt: str, model_name: str, schema: dict | None = None) -> str:
+    """A changed prompt, model or response schema is a new prompt version: old analyses no longer match."""
+    schema_text = json.dumps(schema, sort_keys=True) if schema is not None else ""
+    return hashlib.sha256(f"{model_name}\n{prompt.strip()}\n{schema_text}".encode()).hexdigest()[:16]
+
+
+class AnalysisCache:
+    """
+    Two-tier cache of image analyses: an in-memory LRU in front of a SQLite
+    table, keyed by content hash and prompt version. Only an exact content
+    match is served; a miss whose perceptual hash matches a stored row is
+    counted as a near-duplicate upload but still analyzed again.
+    """
+
+    def __init__(self, path: str = CACHE_DB, max_entries: int = MEMORY_ENTRIES, max_bytes: int = DISK_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                content_hash TEXT NOT NULL,
+                prompt_key TEXT NOT NULL,
+                dhash INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                gen_seconds REAL NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (prompt_key, content_hash)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS analyses_dhash ON analyses (prompt_key, dhash)")
+        self._db.commit()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.near_duplicates = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+
+    def _remember(self, key: tuple[str, str], value: tuple[str, float]):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, content_hash: str, dhash: int, prompt: str) -> str | None:
+        key = (prompt, content_hash)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                text, gen_seconds = self._memory[key]
+                self.memory_hits += 1
+                self.seconds_saved += gen_seconds
+                return text
+
+            row = self._db.execute(
+                "SELECT text, gen_seconds FROM analyses WHERE prompt_key = ? AND content_hash = ?",
+                (prompt, content_hash),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                similar = self._db.execute(
+                    "SELECT 1 FROM analyses WHERE prompt_key = ? AND dhash = ? LIMIT 1", (prompt, dhash),
+                ).fetchone()
+                self.near_duplicates += similar is not None
+                return None
+            self.disk_hits += 1
+            self._db.execute("UPDATE analyses SET last_used = ? WHERE prompt_key = ? AND content_hash = ?",
+                             (time.time(), prompt, content_hash))
+            self._db.commit()
+            self._remember(key, tuple(row))
+            self.seconds_saved += row[1]
+            return row[0]
+
+    def put(self, content_hash: str, dhash: int, prompt: str, text: str, gen_seconds: float):
+        with self._lock:
+            self._remember((prompt, content_hash), (text, gen_seconds))
+            self._db.execute(
+                "INSERT OR REPLACE INTO analyses (content_hash, prompt_key, dhash, text, gen_seconds, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (content_hash, prompt, dhash, text, gen_seconds, len(text.encode()), time.time()),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM analyses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT prompt_key, content_hash, size FROM analyses ORDER BY last_used").fetchall()
+        for prompt, content_hash, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM analyses WHERE prompt_key = ? AND content_hash = ?", (prompt, content_hash))
+            self._memory.pop((prompt, content_hash), None)
+            total -= size
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "lookups": lookups,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "near_duplicates": self.near_duplicates,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "seconds_saved": self.seconds_saved,
+        }
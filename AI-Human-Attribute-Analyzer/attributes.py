@@ -0,0 +1,164 @@
+"""
+Prompt, response schema and parser for the structured attribute analysis.
+
+The model answers with JSON matching RESPONSE_SCHEMA (one object per
+section), so the result cards are built from typed fields instead of
+splitting free text on blank lines and colons.
+"""
+import json
+
+NOT_VISIBLE = "not visible"
+
+# section key: (card title, {field: label})
+SECTIONS = {
+    "demographics": ("🧑‍🤝‍🧑 Demographic & Facial Analysis", {
+        "gender_expression": "Gender Expression",
+        "age_estimate": "Age Estimate",
+        "ethnicity": "Ethnicity",
+        "facial_structure": "Facial Structure",
+        "skin_tone": "Skin Tone",
+        "eye_shape": "Eye Shape",
+    }),
+    "emotion": ("😀 Emotional & Facial Expression Analysis", {
+        "primary_mood": "Primary Mood",
+        "facial_expression": "Facial Expression",
+        "emotions_detected": "Emotions Detected",
+        "confidence": "Confidence Level",
+    }),
+    "clothing": ("👕 Clothing & Fashion Details", {
+        "top": "Top Type",
+        "bottom": "Bottom Type",
+        "colors": "Color of Clothing",
+        "style": "Style & Formality",
+        "brand_logos": "Brand Logos",
+        "season": "Seasonal Clothing",
+    }),
+    "accessories": ("🕶️ Accessories & Appearance Enhancements", {
+        "glasses": "Glasses",
+        "jewelry": "Jewelry",
+        "makeup": "Makeup",
+        "headwear": "Headwear",
+    }),
+    "hair": ("💇 Hair & Facial Features", {
+        "length": "Hair Length",
+        "type": "Hair Type",
+        "color": "Hair Color",
+        "facial_hair": "Facial Hair",
+        "eye_color": "Eye Color",
+    }),
+    "environment": ("📍 Environmental & Background Context", {
+        "setting": "Indoor or Outdoor Setting",
+        "weather": "Weather Condition",
+        "lighting": "Lighting Condition",
+        "background_objects": "Objects in Background",
+        "people_in_background": "People in Background",
+    }),
+}
+
+# System prompt for the image analysis; the sections and fields come from RESPONSE_SCHEMA
+ANALYSIS_PROMPT = """
+You are an AI trained to analyze human attributes from images with high accuracy.
+Analyze the main person in the given image and fill in every field of the JSON schema.
+
+Base every value solely on the visible image data and avoid assumptions beyond what is observable.
+Keep values short (one to four words). Use "not visible" when an attribute can't be observed
+and an empty list when nothing applies; never leave the result empty.
+- age_estimate: approximate age in years
+- confidence: your overall confidence in the analysis, in percent
+- people_in_background: number of other people visible
+"""
+
+INTEGER_FIELDS = {"age_estimate", "confidence", "people_in_background"}
+LIST_FIELDS = {"emotions_detected", "colors", "brand_logos", "background_objects"}
+ENUM_FIELDS = {
+    "gender_expression": ["male", "female", "non-binary", NOT_VISIBLE],
+    "season": ["warm", "cold", "rainy", "all-season", NOT_VISIBLE],
+    "setting": ["indoor", "outdoor", NOT_VISIBLE],
+}
+
+
+def _field_schema(field: str) -> dict:
+    if field in INTEGER_FIELDS:
+        return {"type": "integer"}
+    if field in LIST_FIELDS:
+        return {"type": "array", "items": {"type": "string"}}
+    if field in ENUM_FIELDS:
+        return {"type": "string", "enum": ENUM_FIELDS[field]}
+    return {"type": "string"}
+
+
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        section: {
+            "type": "object",
+            "properties": {field: _field_schema(field) for field in fields},
+            "required": list(fields),
+        }
+        for section, (_, fields) in SECTIONS.items()
+    },
+    "required": list(SECTIONS),
+}
+
+CSV_FIELDS = [f"{section}.{field}" for section, (_, fields) in SECTIONS.items() for field in fields]
+
+
+def _coerce(field: str, value):
+    if field in INTEGER_FIELDS:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    if field in LIST_FIELDS:
+        if value is None:
+            return []
+        return [str(item) for item in value] if isinstance(value, list) else [str(value)]
+    return NOT_VISIBLE if value in (None, "") else str(value)
+
+
+def parse_analysis(text: str) -> dict:
+    """
+    JSON text -> {section: {field: value}} with every section and field
+    present: integers as int (None when missing), lists as list[str] and
+    everything else as str. Raises ValueError when the text is not a JSON object.
+    """
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("analysis is not a JSON object")
+    analysis = {}
+    for section, (_, fields) in SECTIONS.items():
+        values = data.get(section)
+        values = values if isinstance(values, dict) else {}
+        analysis[section] = {field: _coerce(field, values.get(field)) for field in fields}
+    return analysis
+
+
+def format_value(field: str, value) -> str:
+    if field in LIST_FIELDS:
+        return ", ".join(value) if value else "none"
+    if value is None:
+        return NOT_VISIBLE
+    if field == "age_estimate":
+        return f"~{value} years"
+    if field == "confidence":
+        return f"{value}%"
+    return str(value)
+
+
+def analysis_cards(analysis: dict) -> list[tuple[str, list[tuple[str, str]]]]:
+    """[(card title, [(label, display value), ...]), ...] in section order."""
+    return [
+        (title, [(label, format_value(field, analysis[section][field])) for field, label in fields.items()])
+        for section, (title, fields) in SECTIONS.items()
+    ]
+
+
+def _cell(value) -> str:
+    if isinstance(value, list):
+        return "; ".join(value)
+    return "" if value is None else str(value)
+
+
+def flatten(analysis: dict) -> dict[str, str]:
+    """One CSV column per field, e.g. "demographics.age_estimate"; lists are joined with "; "."""
+    return {f"{section}.{field}": _cell(value) for section, values in analysis.items() for field, value in values.items()}
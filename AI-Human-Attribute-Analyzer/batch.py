@@ -0,0 +1,231 @@
+"""
+Batch analysis: run many photos (a ZIP archive or several uploads) through
+the model concurrently and write each result as soon as it completes.
+
+Archives are read one member at a time from the zip's central directory,
+and a new image is only read once a request slot is free, so at most
+`concurrency` images are held in memory however large the archive is.
+"""
+import asyncio
+import csv
+import json
+import os
+import random
+import threading
+import time
+import zipfile
+from pathlib import Path, PurePosixPath
+
+from google.api_core import exceptions as core_exceptions
+
+from analysis_cache import image_fingerprint
+from attributes import CSV_FIELDS, flatten, parse_analysis
+from imageprep import prepare_image
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+MAX_RETRIES = int(os.getenv("BATCH_MAX_RETRIES", "3"))
+MAX_IMAGE_BYTES = int(os.getenv("BATCH_MAX_IMAGE_BYTES", str(40 * 1024 * 1024)))  # skip zip members larger than this
+OUTPUT_DIR = os.getenv("BATCH_OUTPUT_DIR", "batch_results")
+
+# 429 and 5xx (incl. gRPC RESOURCE_EXHAUSTED / UNAVAILABLE / DEADLINE_EXCEEDED) are worth retrying
+RETRYABLE = (core_exceptions.TooManyRequests, core_exceptions.ServerError)
+FIELDS = ["name", "status", "attempts", "seconds", "error"]
+
+
+# --- Reading images ---
+def _is_image(name: str) -> bool:
+    path = PurePosixPath(name)
+    return (path.suffix.lower() in IMAGE_EXTENSIONS and not path.name.startswith(".")
+            and "__MACOSX" not in path.parts)
+
+
+def _zip_members(archive: zipfile.ZipFile) -> list[zipfile.ZipInfo]:
+    return [info for info in archive.infolist() if not info.is_dir() and _is_image(info.filename)]
+
+
+def count_images(files) -> int:
+    """Number of images in the uploads; zips are counted from their directory without decompressing."""
+    total = 0
+    for file in files:
+        if file.name.lower().endswith(".zip"):
+            with zipfile.ZipFile(file) as archive:
+                total += len(_zip_members(archive))
+        elif _is_image(file.name):
+            total += 1
+    return total
+
+
+def iter_images(files):
+    """
+    Yield (name, bytes) for every image in the uploads, lazily. Zip members
+    are decompressed one by one when the next image is asked for; members
+    over MAX_IMAGE_BYTES are yielded with empty bytes so they show up as
+    errors instead of being read.
+    """
+    for file in files:
+        if not file.name.lower().endswith(".zip"):
+            if _is_image(file.name):
+                yield file.name, file.getvalue()
+            continue
+        with zipfile.ZipFile(file) as archive:
+            for info in _zip_members(archive):
+                name = f"{file.name}/{info.filename}"
+                if info.file_size > MAX_IMAGE_BYTES:
+                    yield name, b""
+                else:
+                    yield name, archive.read(info)
+
+
+# --- Writing results ---
+class ResultWriter:
+    """
+    Appends each result to a JSONL and a CSV file as it arrives, flushing
+    every line. JSONL rows hold the parsed analysis object; CSV rows get one
+    column per schema field. Writes after close() are dropped, so a batch
+    still winding down on the loop thread can't hit a closed file.
+    """
+
+    def __init__(self, directory: str = OUTPUT_DIR, stem: str | None = None):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = stem or time.strftime("batch-%Y%m%d-%H%M%S")
+        self.jsonl_path = directory / f"{stem}.jsonl"
+        self.csv_path = directory / f"{stem}.csv"
+        self._jsonl = open(self.jsonl_path, "w", encoding="utf-8")
+        self._csv_file = open(self.csv_path, "w", encoding="utf-8", newline="")
+        self._csv = csv.DictWriter(self._csv_file, fieldnames=FIELDS + CSV_FIELDS)
+        self._csv.writeheader()
+        self._lock = threading.Lock()
+
+    def write(self, result: dict):
+        analysis = parse_analysis(result["analysis"]) if result["analysis"] else None
+        with self._lock:
+            if self._jsonl.closed:
+                return
+            self._jsonl.write(json.dumps({**result, "analysis": analysis}, ensure_ascii=False) + "\n")
+            row = {field: result[field] for field in FIELDS}
+            self._csv.writerow({**row, **(flatten(analysis) if analysis else {})})
+            self._jsonl.flush()
+            self._csv_file.flush()
+
+    def close(self):
+        with self._lock:
+            self._jsonl.close()
+            self._csv_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- Running the batch ---
+def _backoff(attempt: int) -> float:
+    return min(30.0, 1.0 * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+
+def _prepare(data: bytes, max_edge: int, fmt: str, cache, version: str):
+    if not data:
+        raise ValueError(f"image is larger than {MAX_IMAGE_BYTES / 1024 / 1024:.0f} MB")
+    prepared = prepare_image(data, max_edge=max_edge, fmt=fmt)
+    fingerprint = image_fingerprint(prepared.data)
+    cached = cache.get(*fingerprint, version) if cache is not None else None
+    return prepared, fingerprint, cached
+
+
+async def analyze_one(name: str, data: bytes, analyze, max_edge: int, fmt: str, cache=None, version: str = "",
+                      max_retries: int = MAX_RETRIES) -> dict:
+    """Prepare one image, answer from the cache if possible, else call `analyze` with retries."""
+    start = time.perf_counter()
+    result = {"name": name, "status": "ok", "attempts": 0, "seconds": 0.0, "error": "", "analysis": ""}
+    try:
+        # Decoding and resizing is CPU work: keep it off the event loop
+        prepared, (content_hash, dhash), cached = await asyncio.to_thread(
+            _prepare, data, max_edge, fmt, cache, version)
+        if cached is not None:
+            result.update(status="cached", analysis=cached)
+        else:
+            while True:
+                result["attempts"] += 1
+                try:
+                    call_start = time.perf_counter()
+                    result["analysis"] = await analyze(prepared.blob)
+                    break
+                except RETRYABLE:
+                    if result["attempts"] > max_retries:
+                        raise
+                    await asyncio.sleep(_backoff(result["attempts"]))
+            if cache is not None:
+                await asyncio.to_thread(cache.put, content_hash, dhash, version, result["analysis"],
+                                        time.perf_counter() - call_start)
+    except Exception as e:
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+async def run_batch(images, analyze, on_result, concurrency: int = CONCURRENCY, max_retries: int = MAX_RETRIES,
+                    max_edge: int = 1536, fmt: str = "JPEG", cache=None, version: str = "") -> dict:
+    """
+    Analyze every (name, bytes) from `images` with at most `concurrency`
+    images in flight, calling on_result(result) in completion order.
+    `analyze` is an async function taking an image part and returning the
+    analysis JSON text; it should raise on malformed output, which then
+    becomes an error row instead of a cache entry. Returns throughput stats.
+    If the batch is cancelled or reading `images` fails (e.g. a corrupt
+    ZIP), the images in flight are cancelled before the exception leaves.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+    counts = {"ok": 0, "cached": 0, "error": 0}
+    retries = 0
+    model_seconds = 0.0
+    tasks = set()
+    images = iter(images)
+
+    async def worker(name: str, data: bytes):
+        nonlocal retries, model_seconds
+        try:
+            result = await analyze_one(name, data, analyze, max_edge, fmt, cache, version, max_retries)
+        finally:
+            semaphore.release()
+        counts[result["status"]] += 1
+        retries += max(result["attempts"] - 1, 0)
+        if result["status"] == "ok":
+            model_seconds += result["seconds"]
+        on_result(result)
+
+    try:
+        while True:
+            await semaphore.acquire()  # wait for a free slot before reading the next image
+            item = await asyncio.to_thread(next, images, None)
+            if item is None:
+                semaphore.release()
+                break
+            task = asyncio.create_task(worker(*item))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+    finally:
+        # Cancelled or failed: stop the workers so they make no more model calls or on_result callbacks
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    return {
+        "images": total,
+        "analyzed": counts["ok"],
+        "cached": counts["cached"],
+        "errors": counts["error"],
+        "retries": retries,
+        "seconds": round(elapsed, 3),
+        "images_per_sec": round(total / elapsed, 2) if elapsed else 0.0,
+        "mean_latency": round(model_seconds / counts["ok"], 3) if counts["ok"] else 0.0,
+    }
@@ -0,0 +1,103 @@
+"""
+Upload size and end-to-end latency per image with and without the
+preprocessing pipeline, against the local fake Gemini endpoint with a
+simulated uplink:
+
+    python bench_imageprep.py                   # synthetic phone-photo corpus
+    python bench_imageprep.py --corpus ~/Pictures --upload-mbps 20
+
+"old inline" sends the uploaded bytes as-is (the medical assistant);
+"old PIL" passes a full-resolution PIL image, which the SDK re-encodes as
+lossless WebP (the attribute analyzer); "prepared" runs prepare_image first.
+"""
+import argparse
+import io
+import pathlib
+import statistics
+import time
+import warnings
+
+from PIL import Image, ImageFilter
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+import google.generativeai as genai  # noqa: E402
+
+from fake_gemini import start_fake_gemini  # noqa: E402
+from imageprep import prepare_image  # noqa: E402
+
+PROMPT = "Describe the person in this image."
+
+
+def synthetic_corpus(count: int) -> list[tuple[str, bytes]]:
+    """Phone-sized photos (some rotated by EXIF), a screenshot, a 16-bit scan and a small web image."""
+    corpus = []
+    for i in range(count):
+        base = Image.radial_gradient("L").resize((4032, 3024)).convert("RGB")
+        noise = Image.effect_noise((4032, 3024), 25 + i).convert("RGB")
+        photo = Image.blend(base, noise, 0.35).filter(ImageFilter.GaussianBlur(1))
+        exif = Image.Exif()
+        exif[0x0112] = 6 if i % 2 else 1
+        buffer = io.BytesIO()
+        photo.save(buffer, "JPEG", quality=92, exif=exif)
+        corpus.append((f"photo{i}.jpg", buffer.getvalue()))
+    screenshot = io.BytesIO()
+    Image.linear_gradient("L").resize((2560, 1440)).convert("RGB").save(screenshot, "PNG")
+    corpus.append(("screenshot.png", screenshot.getvalue()))
+    xray = io.BytesIO()  # 16-bit grayscale (0-60000), the way scanners export X-rays
+    Image.linear_gradient("L").resize((2000, 2000)).convert("I").point(lambda v: v * 235).convert("I;16").save(xray, "PNG")
+    corpus.append(("xray16.png", xray.getvalue()))
+    small = io.BytesIO()
+    Image.effect_noise((800, 600), 20).convert("RGB").save(small, "JPEG", quality=80)
+    corpus.append(("small.jpg", small.getvalue()))
+    return corpus
+
+
+def load_corpus(folder: str) -> list[tuple[str, bytes]]:
+    paths = sorted(p for p in pathlib.Path(folder).expanduser().iterdir()
+                   if p.suffix.lower() in (".jpg", ".jpeg", ".png", ".webp"))
+    return [(p.name, p.read_bytes()) for p in paths]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", help="folder of images (default: synthetic)")
+    parser.add_argument("--photos", type=int, default=4, help="synthetic phone photos")
+    parser.add_argument("--upload-mbps", type=float, default=20.0)
+    parser.add_argument("--max-edge", type=int, default=1536)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.photos)
+    server = start_fake_gemini(delay=0.05, upload_mbps=args.upload_mbps)
+    genai.configure(api_key="fake", transport="rest",
+                    client_options={"api_endpoint": f"http://127.0.0.1:{server.server_port}"})
+    model = genai.GenerativeModel("gemini-1.5-pro")
+    mime = {".png": "image/png", ".webp": "image/webp"}
+
+    modes = {
+        "old inline": lambda name, data: {"mime_type": mime.get(pathlib.Path(name).suffix.lower(), "image/jpeg"),
+                                          "data": data},
+        "old PIL": lambda name, data: Image.open(io.BytesIO(data)),
+        "prepared": lambda name, data: prepare_image(data, max_edge=args.max_edge).blob,
+    }
+    print(f"{len(corpus)} images, {sum(len(d) for _, d in corpus) / 1e6:.1f} MB, uplink {args.upload_mbps:g} Mbit/s")
+    for label, to_part in modes.items():
+        uploaded_before = server.stats.get("request_bytes", 0)
+        latencies = []
+        for name, data in corpus:
+            start = time.perf_counter()
+            model.generate_content([PROMPT, to_part(name, data)])
+            latencies.append(time.perf_counter() - start)
+        uploaded = server.stats["request_bytes"] - uploaded_before
+        print(f"{label:<11} request bytes={uploaded / 1e6:7.2f} MB  "
+              f"latency mean={statistics.mean(latencies) * 1000:7.0f} ms  max={max(latencies) * 1000:7.0f} ms")
+
+    saved = [prepare_image(data, max_edge=args.max_edge) for _, data in corpus]
+    for (name, data), prepared in zip(corpus, saved):
+        histogram = Image.open(io.BytesIO(prepared.data)).convert("L").histogram()
+        print(f"  {name:<16} {len(data) / 1024:8.0f} KB {prepared.original_size} -> "
+              f"{len(prepared.data) / 1024:6.0f} KB {prepared.size} {prepared.mime_type}  "
+              f"pure white={histogram[255] / sum(histogram):6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Output tokens and parse time of the old free-text analysis versus the
+structured JSON mode:
+
+    python bench_structured.py                       # local fake endpoint
+    GOOGLE_API_KEY=... python bench_structured.py --live --image person.jpg
+
+Against the fake, "text" answers with LEGACY_REPLY (a typical answer to the
+old decorated prompt) and "json" with a sample of RESPONSE_SCHEMA, so the
+token counts are estimates. --live sends the same image to Gemini in both
+modes and reports the billed usage instead. Parse time is measured locally
+either way: blank-line/colon splitting versus json parsing into typed cards.
+"""
+import argparse
+import io
+import os
+import statistics
+import timeit
+import warnings
+
+from PIL import Image
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+import google.generativeai as genai  # noqa: E402
+
+from attributes import ANALYSIS_PROMPT, RESPONSE_SCHEMA, analysis_cards, parse_analysis  # noqa: E402
+from fake_gemini import start_fake_gemini  # noqa: E402
+from imageprep import prepare_image  # noqa: E402
+
+# The text-mode prompt before structured output
+LEGACY_PROMPT = """
+You are an AI trained to analyze human attributes from images with high accuracy.
+Carefully analyze the given image and return the following structured details:
+
+You must provide results based solely on the visible image data. Avoid any assumptions beyond what is observable. Do not apologize or return empty results.
+
+🧑‍🤝‍🧑 Demographic & Facial Analysis:
+- Gender Expression: Male / Female / Non-binary
+- Age Estimate: Approximate age in years
+- Ethnicity: Based on visible features
+- Facial Structure: Notable characteristics
+- Skin Tone: Light, Medium, Dark, specific undertones
+- Eye Shape: Almond, Round, Hooded, etc.
+
+😀 Emotional & Facial Expression Analysis:
+- Primary Mood: Happy, Sad, Neutral, Excited, etc.
+- Facial Expression: Smiling, Frowning, Neutral, Raised Eyebrows
+- Emotions Detected: Joyful, Focused, Angry, Surprised, Anxious
+- Confidence Level: Accuracy of prediction in percentage
+
+👕 Clothing & Fashion Details:
+- Top Type, Bottom Type, Color of Clothing
+- Style & Formality: Casual, Formal, Sportswear, Traditional
+- Brand Logos: Detect if any visible
+- Seasonal Clothing: Identify if suitable for warm, cold, or rainy weather
+
+🕶️ Accessories & Appearance Enhancements:
+- Glasses, Jewelry, Beard & Facial Hair, Makeup, Headwear
+
+💇 Hair & Facial Features:
+- Hair Length, Hair Type, Hair Color
+- Facial Hair: Yes/No (Specify type)
+- Eye Color: Blue, Green, Brown, Hazel, Gray
+
+📍 Environmental & Background Context:
+- Indoor or Outdoor Setting, Weather Condition, Lighting Condition
+- Objects in Background, People in Background
+"""
+
+LEGACY_REPLY = """🧑‍🤝‍🧑 **Demographic & Facial Analysis:**
+- **Gender Expression:** Male
+- **Age Estimate:** Approximately 30-35 years old
+- **Ethnicity:** Appears to be of South Asian descent, based on visible facial features and skin tone
+- **Facial Structure:** Oval face shape with a defined jawline, high cheekbones and a straight nose
+- **Skin Tone:** Medium with warm, golden undertones
+- **Eye Shape:** Almond-shaped eyes with slightly hooded lids
+
+😀 **Emotional & Facial Expression Analysis:**
+- **Primary Mood:** Happy and relaxed
+- **Facial Expression:** Smiling broadly, with visible teeth and slightly raised cheeks
+- **Emotions Detected:** Joyful, content, approachable
+- **Confidence Level:** Approximately 85% confidence in this assessment
+
+👕 **Clothing & Fashion Details:**
+- **Top Type:** Button-down collared shirt with long sleeves rolled up to the elbows
+- **Bottom Type:** Not visible in the image, as the photo is cropped at the waist
+- **Color of Clothing:** Light blue shirt with a subtle white check pattern
+- **Style & Formality:** Smart casual; suitable for the office or a relaxed social event
+- **Brand Logos:** No visible brand logos or text could be detected on the clothing
+- **Seasonal Clothing:** Best suited to mild or warm weather given the light fabric
+
+🕶️ **Accessories & Appearance Enhancements:**
+- **Glasses:** None visible
+- **Jewelry:** A silver wristwatch on the left wrist; no other jewelry is visible
+- **Beard & Facial Hair:** Short, neatly trimmed full beard
+- **Makeup:** No visible makeup
+- **Headwear:** None
+
+💇 **Hair & Facial Features:**
+- **Hair Length:** Short, tapered on the sides
+- **Hair Type:** Straight to slightly wavy
+- **Hair Color:** Dark brown, nearly black
+- **Facial Hair:** Yes (short, well-groomed full beard)
+- **Eye Color:** Dark brown
+
+📍 **Environmental & Background Context:**
+- **Indoor or Outdoor Setting:** Outdoor
+- **Weather Condition:** Sunny and clear, judging by the bright natural light and soft shadows
+- **Lighting Condition:** Natural daylight, evenly lit from the front-left
+- **Objects in Background:** Blurred green trees, a park bench and a paved walking path
+- **People in Background:** Two people are visible in the distance, out of focus
+
+Overall, the image shows a cheerful adult man in smart casual clothing enjoying a sunny day outdoors. \
+Please note that these observations are based solely on visible features and may not reflect the person's actual identity."""
+
+
+def legacy_parse(text: str) -> list[tuple[str, str]]:
+    """The old rendering: split on blank lines, then on the first colon."""
+    cards = []
+    for section in text.split("\n\n"):
+        if ":" in section:
+            title, content = section.split(":", 1)
+            cards.append((title.strip(), content.strip()))
+    return cards
+
+
+def structured_parse(text: str):
+    return analysis_cards(parse_analysis(text))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5, help="requests per mode")
+    parser.add_argument("--live", action="store_true", help="call Gemini with GOOGLE_API_KEY instead of the fake")
+    parser.add_argument("--image", help="photo to analyze (default: synthetic)")
+    parser.add_argument("--model", default="gemini-1.5-pro")
+    args = parser.parse_args()
+
+    if args.image:
+        with open(args.image, "rb") as f:
+            data = f.read()
+    else:
+        buffer = io.BytesIO()
+        Image.effect_noise((1024, 768), 30).convert("RGB").save(buffer, "JPEG", quality=85)
+        data = buffer.getvalue()
+    image = prepare_image(data).blob
+
+    server = None
+    if args.live:
+        genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
+    else:
+        server = start_fake_gemini(delay=0.0, prefill_ms=0.0, reply=LEGACY_REPLY)
+        genai.configure(api_key="fake", transport="rest",
+                        client_options={"api_endpoint": f"http://127.0.0.1:{server.server_port}"})
+
+    modes = {
+        "text": (LEGACY_PROMPT, {"response_mime_type": "text/plain"}, legacy_parse),
+        "json": (ANALYSIS_PROMPT, {"response_mime_type": "application/json", "response_schema": RESPONSE_SCHEMA},
+                 structured_parse),
+    }
+    for label, (prompt, config, parse) in modes.items():
+        model = genai.GenerativeModel(args.model, generation_config=config)
+        output_tokens, prompt_tokens, latencies, texts = [], [], [], []
+        for _ in range(args.requests):
+            start = timeit.default_timer()
+            response = model.generate_content([prompt, image])
+            latencies.append(timeit.default_timer() - start)
+            output_tokens.append(response.usage_metadata.candidates_token_count)
+            prompt_tokens.append(response.usage_metadata.prompt_token_count)
+            texts.append(response.text)
+        loops = 2000
+        parse_seconds = timeit.timeit(lambda: [parse(text) for text in texts], number=loops) / loops / len(texts)
+        cards = parse(texts[0])
+        print(f"{label:<5} output tokens mean={statistics.mean(output_tokens):7.1f}  "
+              f"prompt tokens mean={statistics.mean(prompt_tokens):7.1f}  "
+              f"latency mean={statistics.mean(latencies) * 1000:6.0f} ms  "
+              f"parse={parse_seconds * 1e6:6.1f} µs  cards={len(cards)}  chars={statistics.mean(map(len, texts)):.0f}")
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
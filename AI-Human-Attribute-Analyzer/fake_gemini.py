@@ -0,0 +1,140 @@
+"""
+Minimal Gemini REST generateContent endpoint for offline runs.
+
+Prompt tokens are estimated the way Gemini bills them: about 4 characters
+per text token and a flat 258 tokens per image. Latency is `delay` plus
+`prefill_ms` per 1000 prompt tokens, so longer histories answer slower,
+plus the upload time of the request body at `upload_mbps` when set.
+With `fail_every` set, every Nth request is answered with 429
+RESOURCE_EXHAUSTED, to exercise client retries. Requests with
+responseMimeType "application/json" get a short JSON sample of their
+responseSchema instead of the text reply.
+The server keeps request/token/byte totals in `server.stats`.
+
+    python fake_gemini.py --port 8766
+    GEMINI_API_ENDPOINT=http://127.0.0.1:8766 streamlit run main.py
+"""
+import argparse
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+IMAGE_TOKENS = 258
+SCHEMA_TYPES = {1: "STRING", 2: "NUMBER", 3: "INTEGER", 4: "BOOLEAN", 5: "ARRAY", 6: "OBJECT"}
+REPLY = ("Findings: the image shows normal anatomical structures with no acute abnormality. "
+         "Impression: no urgent findings; correlate clinically and consult a radiologist. ")
+
+
+def count_tokens(contents: list[dict]) -> int:
+    tokens = 0
+    for content in contents:
+        for part in content.get("parts", []):
+            if "text" in part:
+                tokens += math.ceil(len(part["text"]) / 4)
+            elif "inlineData" in part:
+                tokens += IMAGE_TOKENS
+    return tokens
+
+
+def sample_from_schema(schema: dict):
+    """A small value matching an OpenAPI-style schema (types may be enum numbers or names)."""
+    kind = schema.get("type")
+    kind = SCHEMA_TYPES.get(kind, str(kind).upper())
+    if kind == "OBJECT":
+        return {name: sample_from_schema(sub) for name, sub in schema.get("properties", {}).items()}
+    if kind == "ARRAY":
+        return [sample_from_schema(schema.get("items", {"type": "STRING"}))]
+    if kind == "INTEGER":
+        return 30
+    if kind == "NUMBER":
+        return 0.5
+    if kind == "BOOLEAN":
+        return False
+    return schema["enum"][0] if schema.get("enum") else "sample value"
+
+
+def make_handler(delay: float, prefill_ms: float, reply: str, stats: dict, upload_mbps: float = 0.0,
+                 fail_every: int = 0):
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            system = request.get("systemInstruction")
+            prompt_tokens = count_tokens(request.get("contents", []) + ([system] if system else []))
+            config = request.get("generationConfig", {})
+            text = reply
+            if config.get("responseMimeType") == "application/json":
+                text = json.dumps(sample_from_schema(config.get("responseSchema", {"type": "OBJECT"})))
+            output_tokens = math.ceil(len(text) / 4)
+            upload = length * 8 / (upload_mbps * 1e6) if upload_mbps else 0.0
+            time.sleep(delay + prefill_ms * prompt_tokens / 1000 / 1000 + upload)
+            with lock:
+                stats["requests"] = stats.get("requests", 0) + 1
+                stats["prompt_tokens"] = stats.get("prompt_tokens", 0) + prompt_tokens
+                stats["request_bytes"] = stats.get("request_bytes", 0) + length
+                throttled = fail_every and stats["requests"] % fail_every == 0
+                stats["throttled"] = stats.get("throttled", 0) + bool(throttled)
+                stats["output_tokens"] = stats.get("output_tokens", 0) + (0 if throttled else output_tokens)
+            if throttled:
+                body = json.dumps({"error": {"code": 429, "message": "Resource has been exhausted (e.g. check quota).",
+                                             "status": "RESOURCE_EXHAUSTED"}}).encode()
+                self.send_response(429)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            body = json.dumps({
+                "candidates": [{
+                    "content": {"role": "model", "parts": [{"text": text}]},
+                    "finishReason": "STOP",
+                    "index": 0,
+                }],
+                "usageMetadata": {
+                    "promptTokenCount": prompt_tokens,
+                    "candidatesTokenCount": output_tokens,
+                    "totalTokenCount": prompt_tokens + output_tokens,
+                },
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_fake_gemini(delay: float = 0.05, port: int = 0, prefill_ms: float = 20.0,
+                      reply: str = REPLY, upload_mbps: float = 0.0, fail_every: int = 0) -> ThreadingHTTPServer:
+    stats = {}
+    server = ThreadingHTTPServer(("127.0.0.1", port),
+                                 make_handler(delay, prefill_ms, reply, stats, upload_mbps, fail_every))
+    server.stats = stats
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--prefill-ms", type=float, default=20.0, help="extra latency per 1000 prompt tokens")
+    parser.add_argument("--upload-mbps", type=float, default=0.0, help="simulated uplink bandwidth (0 = unlimited)")
+    parser.add_argument("--fail-every", type=int, default=0, help="answer every Nth request with 429 (0 = never)")
+    args = parser.parse_args()
+    server = start_fake_gemini(args.delay, args.port, args.prefill_ms, upload_mbps=args.upload_mbps,
+                               fail_every=args.fail_every)
+    print(f"Fake Gemini endpoint on http://127.0.0.1:{server.server_port}")
+    threading.Event().wait()
@@ -0,0 +1,141 @@
+import io
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from PIL import Image, ImageOps
+
+MAX_EDGE = int(os.getenv("IMAGE_MAX_EDGE", "1536"))       # longest side sent to the model, in pixels
+IMAGE_FORMAT = os.getenv("IMAGE_FORMAT", "JPEG")           # JPEG or WEBP
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "85"))
+
+MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+HIGH_BIT_MODES = ("I;16", "I;16B", "I;16L", "I;16N", "I", "F")  # 16/32-bit grayscale, e.g. scanned X-rays
+EXIF_ORIENTATION = 0x0112
+
+
+@dataclass
+class PreparedImage:
+    data: bytes
+    mime_type: str
+    size: tuple[int, int]
+    original_bytes: int
+    original_size: tuple[int, int]
+
+    @property
+    def blob(self) -> dict:
+        """Inline part for google.generativeai generate_content / send_message."""
+        return {"mime_type": self.mime_type, "data": self.data}
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - len(self.data)
+
+
+def _to_8bit(image: Image.Image) -> Image.Image:
+    """
+    Stretch a high-bit-depth grayscale image to 8 bits over its own min/max
+    (like the DICOM window) instead of letting convert() clip it at 255.
+    """
+    image = image.convert("F" if image.mode == "F" else "I")
+    low, high = image.getextrema()
+    scale = 255.0 / max(high - low, 1)
+    return image.point(lambda v: (v - low) * scale).convert("L")
+
+
+def _flatten(image: Image.Image, keep_alpha: bool) -> Image.Image:
+    if image.mode in HIGH_BIT_MODES:
+        return _to_8bit(image)
+    if image.mode in ("RGB", "L") or (keep_alpha and image.mode == "RGBA"):
+        return image
+    if image.mode in ("RGBA", "LA", "P", "PA") and not keep_alpha:
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, "white")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGBA" if keep_alpha and "A" in image.getbands() else "RGB")
+
+
+def _encode(image: Image.Image, fmt: str, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == "WEBP":
+        image.save(buffer, "WEBP", quality=quality, method=4)
+    elif fmt == "PNG":
+        image.save(buffer, "PNG")
+    else:
+        image.save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def prepare_image(data: bytes, max_edge: int = MAX_EDGE, fmt: str = IMAGE_FORMAT,
+                  quality: int = IMAGE_QUALITY) -> PreparedImage:
+    """
+    Orient, downscale and re-encode an uploaded photo before it is sent to
+    the model. JPEGs are decoded with draft(), which lets libjpeg scale by
+    1/2, 1/4 or 1/8 while decoding instead of building the full-resolution
+    bitmap first. The original bytes are kept when they are already small
+    enough, upright, and re-encoding would not make them smaller.
+    """
+    fmt = fmt.upper()
+    image = Image.open(io.BytesIO(data))
+    original_format, original_size = image.format, image.size
+    rotated = image.getexif().get(EXIF_ORIENTATION, 1) not in (0, 1)
+    if original_format == "JPEG":
+        image.draft("RGB", (max_edge, max_edge))
+    image = ImageOps.exif_transpose(image)  # phone photos are often stored sideways with an EXIF flag
+    image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS, reducing_gap=3.0)
+    encoded = _encode(_flatten(image, keep_alpha=fmt in ("WEBP", "PNG")), fmt, quality)
+    if original_format == "PNG" and fmt != "PNG":
+        # Screenshots and diagrams compress better losslessly
+        lossless = _encode(_flatten(image, keep_alpha=True), "PNG", quality)
+        if len(lossless) < len(encoded):
+            encoded, fmt = lossless, "PNG"
+
+    if max(original_size) <= max_edge and not rotated and original_format in MIME_TYPES and len(data) <= len(encoded):
+        return PreparedImage(data, MIME_TYPES[original_format], original_size, len(data), original_size)
+    return PreparedImage(encoded, MIME_TYPES[fmt], image.size, len(data), original_size)
+
+
+# --- DICOM (optional: needs pydicom and numpy) ---
+def _first(value):
+    """WindowCenter / WindowWidth may hold several values; use the first."""
+    return float(value[0] if isinstance(value, Sequence) and not isinstance(value, str) else value)
+
+
+def dicom_to_image(data: bytes, center: float | None = None, width: float | None = None) -> Image.Image:
+    """
+    Window a DICOM slice into an 8-bit grayscale image: apply the rescale
+    slope/intercept, then the given window (or the file's own, or a 0.5-99.5
+    percentile window when it has none).
+    """
+    try:
+        import numpy as np
+        import pydicom
+    except ImportError:
+        raise RuntimeError("DICOM uploads need the optional packages: pip install pydicom numpy") from None
+
+    ds = pydicom.dcmread(io.BytesIO(data), force=True)
+    pixels = ds.pixel_array.astype(np.float32)
+    if pixels.ndim == 3 and int(ds.get("SamplesPerPixel", 1)) == 1:
+        pixels = pixels[pixels.shape[0] // 2]  # multi-frame: take the middle slice
+    pixels = pixels * float(ds.get("RescaleSlope", 1)) + float(ds.get("RescaleIntercept", 0))
+
+    if center is None or width is None:
+        if ds.get("WindowCenter") is not None and ds.get("WindowWidth") is not None:
+            center, width = _first(ds.WindowCenter), _first(ds.WindowWidth)
+        else:
+            low, high = np.percentile(pixels, (0.5, 99.5))
+            center, width = (low + high) / 2, max(high - low, 1.0)
+    scaled = np.clip((pixels - (center - width / 2)) / max(width, 1.0), 0.0, 1.0) * 255.0
+    if ds.get("PhotometricInterpretation") == "MONOCHROME1":  # bright means low values
+        scaled = 255.0 - scaled
+    return Image.fromarray(scaled.astype(np.uint8), "L")
+
+
+def prepare_dicom(data: bytes, max_edge: int = MAX_EDGE, center: float | None = None,
+                  width: float | None = None) -> PreparedImage:
+    """DICOM -> windowed, downscaled PNG (lossless, so no compression artifacts on scans)."""
+    image = dicom_to_image(data, center, width)
+    original_size = image.size
+    image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS, reducing_gap=3.0)
+    return PreparedImage(_encode(image, "PNG", 0), "image/png", image.size, len(data), original_size)
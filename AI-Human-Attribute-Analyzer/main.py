@@ -1,15 +1,28 @@
+import asyncio
+import html
+import os
+import queue
+import threading
+import time
+import zipfile
 import streamlit as st
-import PIL.Image
 import google.generativeai as genai
 from google.generativeai import types
-from PIL import Image
+from imageprep import IMAGE_FORMAT, MAX_EDGE, prepare_image
+from analysis_cache import AnalysisCache, image_fingerprint, prompt_key
+from attributes import ANALYSIS_PROMPT, RESPONSE_SCHEMA, analysis_cards, parse_analysis
+from batch import CONCURRENCY, ResultWriter, count_images, iter_images, run_batch
 
 # Set page configuration
 st.set_page_config(page_title="📸 PersonaVision AI", layout="wide")
 
 # Load API key
 api_key = st.secrets["GOOGLE_API_KEY"]
-genai.configure(api_key=api_key)
+USE_REST = bool(os.getenv("GEMINI_API_ENDPOINT"))
+if USE_REST:  # e.g. the local fake_gemini.py server
+    genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": os.getenv("GEMINI_API_ENDPOINT")})
+else:
+    genai.configure(api_key=api_key)
 
 # Model configuration
 generation_config = {
@@ -17,7 +30,8 @@ generation_config = {
     "top_p": 0.95,
     "top_k": 64,
     "max_output_tokens": 8192,
-    "response_mime_type": "text/plain",
+    "response_mime_type": "application/json",
+    "response_schema": RESPONSE_SCHEMA,  # one object per result card, see attributes.py
 }
 
 # Initialize Gemini model
@@ -26,48 +40,40 @@ model = genai.GenerativeModel(
     generation_config=generation_config,
 )
 
-# System Prompt for Image Analysis (unchanged)
+# Downscale and re-encode once per upload and setting, not on every rerun
+@st.cache_data(max_entries=16, show_spinner=False)
+def prepare_upload(data, max_edge, fmt):
+    start = time.perf_counter()
+    prepared = prepare_image(data, max_edge=max_edge, fmt=fmt)
+    return prepared, time.perf_counter() - start, image_fingerprint(prepared.data)
+
+# Analyses by image hash and prompt version (shared by every session in this process)
+@st.cache_resource
+def get_analysis_cache():
+    return AnalysisCache()
+
+# One background event loop for batch runs: the SDK's async gRPC client is bound to the loop it was created on
+@st.cache_resource
+def get_batch_loop():
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="batch-runtime", daemon=True).start()
+    return loop
+
+def _analysis_text(response):
+    text = response.text.strip()
+    parse_analysis(text)  # raises ValueError on malformed JSON, so it is never cached
+    return text
+
 def analyze_human_attributes(image):
-    prompt = """  
-You are an AI trained to analyze human attributes from images with high accuracy.  
-Carefully analyze the given image and return the following structured details:  
-
-You must provide results based solely on the visible image data. Avoid any assumptions beyond what is observable. Do not apologize or return empty results.  
-
-🧑‍🤝‍🧑 Demographic & Facial Analysis:  
-- Gender Expression: Male / Female / Non-binary  
-- Age Estimate: Approximate age in years  
-- Ethnicity: Based on visible features  
-- Facial Structure: Notable characteristics  
-- Skin Tone: Light, Medium, Dark, specific undertones  
-- Eye Shape: Almond, Round, Hooded, etc.  
-
-😀 Emotional & Facial Expression Analysis:  
-- Primary Mood: Happy, Sad, Neutral, Excited, etc.  
-- Facial Expression: Smiling, Frowning, Neutral, Raised Eyebrows  
-- Emotions Detected: Joyful, Focused, Angry, Surprised, Anxious  
-- Confidence Level: Accuracy of prediction in percentage  
-
-👕 Clothing & Fashion Details:  
-- Top Type, Bottom Type, Color of Clothing  
-- Style & Formality: Casual, Formal, Sportswear, Traditional  
-- Brand Logos: Detect if any visible  
-- Seasonal Clothing: Identify if suitable for warm, cold, or rainy weather  
-
-🕶️ Accessories & Appearance Enhancements:  
-- Glasses, Jewelry, Beard & Facial Hair, Makeup, Headwear  
-
-💇 Hair & Facial Features:  
-- Hair Length, Hair Type, Hair Color  
-- Facial Hair: Yes/No (Specify type)  
-- Eye Color: Blue, Green, Brown, Hazel, Gray  
-
-📍 Environmental & Background Context:  
-- Indoor or Outdoor Setting, Weather Condition, Lighting Condition  
-- Objects in Background, People in Background  
-"""  
-    response = model.generate_content([prompt, image])
-    return response.text.strip()
+    response = model.generate_content([ANALYSIS_PROMPT, image])
+    return _analysis_text(response)
+
+async def analyze_human_attributes_async(image):
+    if USE_REST:  # the SDK's REST transport has no async client: run the sync call in a worker thread
+        response = await asyncio.to_thread(model.generate_content, [ANALYSIS_PROMPT, image])
+    else:
+        response = await model.generate_content_async([ANALYSIS_PROMPT, image])
+    return _analysis_text(response)
 
 # Enhanced Custom Styling
 st.markdown("""
@@ -184,37 +190,108 @@ st.markdown("<div class='upload-box'>", unsafe_allow_html=True)
 uploaded_image = st.file_uploader("📤 Upload an image", type=["jpg", "jpeg", "png"])
 st.markdown("</div>", unsafe_allow_html=True)
 
+with st.expander("⚙️ Upload settings"):
+    max_edge = st.slider("Longest image side sent to the model (px)", 512, 3072, MAX_EDGE, step=128)
+    image_format = st.selectbox("Upload format", ["JPEG", "WEBP"], index=["JPEG", "WEBP"].index(IMAGE_FORMAT.upper()))
+
 # If an image is uploaded, analyze it
 if uploaded_image:
-    img = PIL.Image.open(uploaded_image)
+    prepared, prep_seconds, (content_hash, dhash) = prepare_upload(uploaded_image.getvalue(), max_edge, image_format)
 
     # Display image & results side by side
     col1, col2 = st.columns([1, 1.5])
 
     with col1:
-        st.image(img, caption="📷 Uploaded Image", use_container_width=True)
+        st.image(prepared.data, caption="📷 Uploaded Image", use_container_width=True)
+        st.caption(f"📦 {prepared.original_bytes / 1024:,.0f} KB → {len(prepared.data) / 1024:,.0f} KB "
+                   f"({prepared.size[0]}×{prepared.size[1]}, prepared in {prep_seconds * 1000:.0f} ms)")
 
     with col2:
         st.markdown("<div class='result-container'>", unsafe_allow_html=True)
         st.subheader("📊 Analysis Results")
 
-        with st.spinner("🧐 Analyzing image attributes..."):
-            analysis_result = analyze_human_attributes(img)
-
-        # Split response into sections & display in cards
-        sections = analysis_result.split("\n\n")
-        for section in sections:
-            if ":" in section:
-                title, content = section.split(":", 1)
-                st.markdown(f"""
-                    <div class='result-card'>
-                        <div class='result-title'>{title.strip()}</div>
-                        <div class='result-text'>{content.strip()}</div>
-                    </div>
-                """, unsafe_allow_html=True)
+        # Reruns and identical uploads are answered from the cache instead of calling the model again
+        analysis_cache = get_analysis_cache()
+        version = prompt_key(ANALYSIS_PROMPT, model.model_name, RESPONSE_SCHEMA)
+        analysis_result = analysis_cache.get(content_hash, dhash, version)
+        if analysis_result is None:
+            with st.spinner("🧐 Analyzing image attributes..."):
+                start = time.perf_counter()
+                analysis_result = analyze_human_attributes(prepared.blob)
+                analysis_cache.put(content_hash, dhash, version, analysis_result, time.perf_counter() - start)
+        stats = analysis_cache.stats()
+        st.caption(f"💾 {stats['hit_rate']:.0%} of analyses served from cache "
+                   f"(~{stats['seconds_saved']:.0f}s saved; {stats['near_duplicates']} near-duplicate uploads re-analyzed)")
+
+        # One card per schema section, built from the typed fields
+        for title, rows in analysis_cards(parse_analysis(analysis_result)):
+            content = "\n".join(f"<b>{label}:</b> {html.escape(value)}" for label, value in rows)
+            st.markdown(f"""
+                <div class='result-card'>
+                    <div class='result-title'>{title}</div>
+                    <div class='result-text'>{content}</div>
+                </div>
+            """, unsafe_allow_html=True)
 
         st.markdown("</div>", unsafe_allow_html=True)
 
+# Batch mode: a ZIP archive or many photos at once
+with st.expander("📦 Batch analysis (ZIP or multiple images)"):
+    batch_files = st.file_uploader("📤 Upload a ZIP archive or several images", type=["zip", "jpg", "jpeg", "png"],
+                                   accept_multiple_files=True, key="batch_files")
+    concurrency = st.slider("Parallel requests", 1, 32, CONCURRENCY)
+
+    if batch_files and st.button("🚀 Analyze all"):
+        try:
+            total = count_images(batch_files)
+        except zipfile.BadZipFile as e:
+            total = None
+            st.error(f"❌ Could not read the ZIP archive: {e}")
+        if total is not None:
+            progress = st.progress(0.0, text=f"0 / {total} images")
+            finished = queue.Queue()
+            start = time.perf_counter()
+            with ResultWriter() as writer:
+                def on_result(result):
+                    writer.write(result)  # rows are on disk as soon as each image completes
+                    finished.put(result)
+
+                future = asyncio.run_coroutine_threadsafe(
+                    run_batch(iter_images(batch_files), analyze_human_attributes_async, on_result, concurrency,
+                              max_edge=max_edge, fmt=image_format, cache=get_analysis_cache(),
+                              version=prompt_key(ANALYSIS_PROMPT, model.model_name, RESPONSE_SCHEMA)),
+                    get_batch_loop(),
+                )
+                done = errors = 0
+                try:
+                    while not (future.done() and finished.empty()):
+                        try:
+                            result = finished.get(timeout=0.2)
+                        except queue.Empty:
+                            continue
+                        done += 1
+                        errors += result["status"] == "error"
+                        rate = done / (time.perf_counter() - start)
+                        progress.progress(min(done / max(total, 1), 1.0),
+                                          text=f"{done} / {total} images · {rate:.1f} images/s · {errors} errors")
+                    st.session_state.batch_stats = future.result()
+                    st.session_state.batch_outputs = (writer.jsonl_path, writer.csv_path)
+                except zipfile.BadZipFile as e:
+                    st.error(f"❌ Could not read the ZIP archive: {e}")
+                finally:
+                    future.cancel()  # the script was stopped (rerun or closed tab): stop the batch with it
+
+    if "batch_outputs" in st.session_state:
+        stats = st.session_state.batch_stats
+        st.caption(f"✅ {stats['images']} images in {stats['seconds']:.1f}s ({stats['images_per_sec']:.1f} images/s): "
+                   f"{stats['analyzed']} analyzed, {stats['cached']} from cache, {stats['errors']} errors, "
+                   f"{stats['retries']} retries, {stats['mean_latency']:.1f}s mean per image")
+        jsonl_path, csv_path = st.session_state.batch_outputs
+        col1, col2 = st.columns(2)
+        col1.download_button("⬇️ Results (JSONL)", jsonl_path.read_bytes(), file_name=jsonl_path.name,
+                             mime="application/jsonl")
+        col2.download_button("⬇️ Results (CSV)", csv_path.read_bytes(), file_name=csv_path.name, mime="text/csv")
+
 # Footer
 st.markdown("""
     <div style='text-align: center; color: #666; padding: 2rem;'>
@@ -0,0 +1,45 @@
+"""
+Microbenchmark of the safe calculator against Python's eval:
+
+    python bench_calculator.py --runs 20000
+"""
+import argparse
+import time
+
+from calculator import evaluate, evaluate_many
+
+EXPRESSIONS = ["(5 * 3) + 2", "sqrt(16) + 2 ** 10 / 3", "((1 + 2) * (3 + 4) - 5) % 7", "max(3, 9) * pi"]
+SAFE_EVAL_GLOBALS = {"__builtins__": {}, "sqrt": __import__("math").sqrt, "max": max, "pi": __import__("math").pi}
+
+
+def timed(label, fn, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    per_call = (time.perf_counter() - start) / runs
+    print(f"{label:<34} {per_call * 1e6:8.2f} µs/call")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20000)
+    args = parser.parse_args()
+
+    for expression in EXPRESSIONS:
+        print(f"\n{expression}")
+        timed("eval", lambda: eval(expression, SAFE_EVAL_GLOBALS), args.runs)
+        timed("calculator (compiled, cached)", lambda: evaluate(expression), args.runs)
+
+    bindings = [{"x": i, "y": i / 2} for i in range(args.runs)]
+    print("\nx ** 2 + 3 * y - 1 over", args.runs, "bindings")
+    start = time.perf_counter()
+    for env in bindings:
+        eval("x ** 2 + 3 * y - 1", {"__builtins__": {}}, env)
+    print(f"{'eval per binding':<34} {(time.perf_counter() - start) / args.runs * 1e6:8.2f} µs/row")
+    start = time.perf_counter()
+    evaluate_many("x ** 2 + 3 * y - 1", bindings)
+    print(f"{'calculator evaluate_many':<34} {(time.perf_counter() - start) / args.runs * 1e6:8.2f} µs/row")
+
+
+if __name__ == "__main__":
+    main()
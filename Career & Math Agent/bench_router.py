@@ -0,0 +1,53 @@
+"""
+Routing accuracy and latency of the local intent router on the labeled
+test set, compared with the old keyword scan. Rows labeled "other"
+(greetings, off-topic chat) should go to the triage agent, i.e. route to None:
+
+    python bench_router.py
+"""
+import json
+import time
+
+from router import router
+
+KEYWORDS = ["career", "job", "profession", "future"]
+
+
+def keyword_route(text: str) -> str:
+    return "career" if any(x in text.lower() for x in KEYWORDS) else "math"
+
+
+def main():
+    with open("router_testset.jsonl", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+
+    keyword_correct = sum(keyword_route(r["text"]) == r["label"] for r in rows)
+    model_correct = confident = confident_correct = to_triage = 0
+    start = time.perf_counter()
+    for r in rows:
+        label, confidence = router.predict(r["text"])
+        model_correct += label == r["label"]
+        routed, _ = router.route(r["text"])
+        if routed is not None:
+            confident += 1
+            confident_correct += routed == r["label"]
+        elif r["label"] == "other":
+            to_triage += 1
+    per_query = (time.perf_counter() - start) / (2 * len(rows))
+    others = sum(r["label"] == "other" for r in rows)
+
+    print(f"test set:          {len(rows)} labeled queries")
+    print(f"keyword scan:      accuracy {keyword_correct / len(rows):.1%}")
+    print(f"n-gram softmax:   accuracy {model_correct / len(rows):.1%}  "
+          f"({per_query * 1e6:.1f} µs/query)")
+    print(f"confident routes:  {confident / len(rows):.1%} of queries, "
+          f"accuracy {confident_correct / max(confident, 1):.1%}; the rest fall back to model handoff")
+    print(f"off-topic queries: {to_triage} / {others} sent to the triage agent")
+    for r in rows:
+        label, confidence = router.predict(r["text"])
+        if label != r["label"]:
+            print(f"  miss: {r['text']!r} -> {label} ({confidence:.2f})")
+
+
+if __name__ == "__main__":
+    main()
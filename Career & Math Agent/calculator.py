@@ -0,0 +1,202 @@
+import ast
+import math
+import operator
+import re
+from functools import lru_cache
+
+# --- Limits ---
+MAX_LENGTH = 500          # characters in one expression
+MAX_NODES = 200           # AST nodes in one expression
+MAX_STEPS = 10_000        # operations per evaluation
+MAX_EXPONENT = 10_000     # |b| in a ** b
+MAX_INT_BITS = 13_000     # size of any integer result (~3900 digits, still printable)
+MAX_FACTORIAL = 1_000
+
+
+class CalculatorError(ValueError):
+    pass
+
+
+def _pow(a, b):
+    if abs(b) > MAX_EXPONENT:
+        raise CalculatorError(f"exponent {b} is too large (limit {MAX_EXPONENT})")
+    if isinstance(a, int) and isinstance(b, int) and b > 0 and abs(a) > 1:
+        if b * a.bit_length() > MAX_INT_BITS:
+            raise CalculatorError("result is too large")
+    return operator.pow(a, b)
+
+
+def _round(x, ndigits=None):
+    # int.__round__ builds 10 ** -ndigits inside the builtin, out of reach of _check
+    if ndigits is None:
+        return round(x)
+    if not isinstance(ndigits, int):
+        raise CalculatorError("round() digits must be an integer")
+    return round(x, max(-MAX_EXPONENT, min(MAX_EXPONENT, ndigits)))
+
+
+def _factorial(n):
+    if n > MAX_FACTORIAL:
+        raise CalculatorError(f"factorial argument is too large (limit {MAX_FACTORIAL})")
+    return math.factorial(n)
+
+
+BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _pow,
+    ast.BitXor: _pow,  # "2 ^ 3" means power in a calculator
+}
+
+UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+FUNCTIONS = {
+    "abs": abs, "round": _round, "min": min, "max": max,
+    "sqrt": math.sqrt, "exp": math.exp, "log": math.log, "log10": math.log10, "log2": math.log2,
+    "sin": math.sin, "cos": math.cos, "tan": math.tan,
+    "asin": math.asin, "acos": math.acos, "atan": math.atan,
+    "degrees": math.degrees, "radians": math.radians, "hypot": math.hypot,
+    "floor": math.floor, "ceil": math.ceil, "factorial": _factorial,
+}
+
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+
+def _check(value):
+    if isinstance(value, complex):  # e.g. (-8) ** (1/3)
+        raise CalculatorError("result is not a real number")
+    if isinstance(value, int) and value.bit_length() > MAX_INT_BITS:
+        raise CalculatorError("result is too large")
+    return value
+
+
+def _compile_node(node):
+    """Turn a whitelisted AST node into a closure taking (variables, budget)."""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+        return lambda env, budget: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return lambda env, budget: value
+
+        def variable(env, budget):
+            try:
+                return env[name]
+            except KeyError:
+                raise CalculatorError(f"unknown name '{name}'") from None
+        return variable
+
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPS:
+        op = BINARY_OPS[type(node.op)]
+        left, right = _compile_node(node.left), _compile_node(node.right)
+
+        def binary(env, budget):
+            budget[0] -= 1
+            if budget[0] < 0:
+                raise CalculatorError("expression takes too many steps")
+            return _check(op(left(env, budget), right(env, budget)))
+        return binary
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPS:
+        op = UNARY_OPS[type(node.op)]
+        operand = _compile_node(node.operand)
+        return lambda env, budget: op(operand(env, budget))
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS \
+            and not node.keywords:
+        func = FUNCTIONS[node.func.id]
+        args = [_compile_node(arg) for arg in node.args]
+
+        def call(env, budget):
+            budget[0] -= 1
+            if budget[0] < 0:
+                raise CalculatorError("expression takes too many steps")
+            return _check(func(*(arg(env, budget) for arg in args)))
+        return call
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        raise CalculatorError(f"function '{node.func.id}' is not allowed")
+    raise CalculatorError(f"{type(node).__name__} is not allowed in a math expression")
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression: str):
+    """Parse and validate once; repeated expressions come straight from the LRU."""
+    if len(expression) > MAX_LENGTH:
+        raise CalculatorError(f"expression is longer than {MAX_LENGTH} characters")
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError:
+        raise CalculatorError("invalid math expression") from None
+    if sum(1 for _ in ast.walk(tree)) > MAX_NODES:
+        raise CalculatorError("expression is too long")
+    return _compile_node(tree.body)
+
+
+def evaluate(expression: str, variables: dict | None = None):
+    """Safely evaluate an arithmetic expression such as '5 * (2 + 3)'."""
+    compiled = compile_expression(expression)
+    try:
+        return compiled(variables or {}, [MAX_STEPS])
+    except CalculatorError:
+        raise
+    except (ArithmeticError, ValueError, TypeError) as e:
+        raise CalculatorError(str(e)) from None
+
+
+def evaluate_many(expression: str, bindings) -> list:
+    """
+    Evaluate one expression over many variable bindings, e.g.
+    evaluate_many("x ** 2 + y", [{"x": 1, "y": 2}, {"x": 3, "y": 4}]).
+    The expression is compiled once; a failing binding yields its CalculatorError.
+    """
+    compiled = compile_expression(expression)
+    results = []
+    for env in bindings:
+        try:
+            results.append(compiled(env, [MAX_STEPS]))
+        except CalculatorError as e:
+            results.append(e)
+        except (ArithmeticError, ValueError, TypeError) as e:
+            results.append(CalculatorError(str(e)))
+    return results
+
+
+# --- Fast path: spot queries that are nothing but arithmetic ---
+QUESTION_PREFIX = re.compile(
+    r"^\s*(?:(?:please|hey|hi)[\s,]+)?(?:what\s+is|what's|whats|calculate|compute|solve|evaluate|eval)?\s*:?\s*",
+    re.IGNORECASE,
+)
+ARITHMETIC_CHARS = re.compile(r"^[\d\s.+\-*/%^(),]*$")
+HAS_OPERATOR = re.compile(r"[-+*/%^]|\w\(")
+
+
+def extract_expression(query: str) -> str | None:
+    """
+    Return the expression if the query is self-contained arithmetic
+    ("(5 * 3) + 2", "What is 2^10?"), else None.
+    """
+    text = QUESTION_PREFIX.sub("", query.strip(), count=1).rstrip(" ?=.!")
+    if not text or not HAS_OPERATOR.search(text):
+        return None
+    # Only digits, operators and whitelisted function / constant names may remain
+    names = set(re.findall(r"[A-Za-z_]\w*", text))
+    if names - FUNCTIONS.keys() - CONSTANTS.keys():
+        return None
+    if not ARITHMETIC_CHARS.match(re.sub(r"[A-Za-z_]\w*", "", text)):
+        return None
+    try:
+        compile_expression(text)
+    except CalculatorError:
+        return None
+    return text
@@ -1,5 +1,6 @@
 import streamlit as st
 import os
+import time
 from dotenv import load_dotenv
 
 # --- Load API Key ---
@@ -13,37 +14,23 @@ if not gemini_api_key:
 from agents import (
     Runner,
     Agent,
-    AsyncOpenAI,
-    OpenAIChatCompletionsModel,
-    RunConfig,
     function_tool
 )
+from runtime import get_runtime, run_async
+from calculator import CalculatorError, evaluate, extract_expression
+from router import router
 
-# --- External Gemini Client Setup ---
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
-
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# --- External Gemini Client Setup (cached across reruns) ---
+external_client, model, config = get_runtime(gemini_api_key, "gemini-2.0-flash")
 
 # --- Calculator Tool (No args in decorator) ---
 @function_tool
 def calculate(expression: str) -> str:
     """Solves basic math expressions like '5 * (2 + 3)'"""
     try:
-        result = eval(expression)
+        result = evaluate(expression)
         return f"Result: {result}"
-    except Exception as e:
+    except CalculatorError as e:
         return f"Error: {str(e)}"
 
 # --- Career Advisor Agent (No tools) ---
@@ -62,6 +49,14 @@ main_agent = Agent(
     model=model,
 )
 
+# --- Triage Agent (model-driven handoff, used only when the local router is unsure) ---
+triage_agent = Agent(
+    name="Triage",
+    instructions="Hand off career and job questions to CareerAdvisor, and math or anything else to MainAgent.",
+    handoffs=[career_agent, main_agent],
+    model=model,
+)
+
 # --- UI Setup ---
 st.set_page_config(page_title="🎓 AI Career & Math Advisor", page_icon="🤖", layout="centered")
 
@@ -109,28 +104,55 @@ with st.container():
 st.markdown("### 🤔 What's your question?")
 query = st.text_area("Ask about a career or a math problem:", placeholder="e.g. What is (5 * 3) + 2? OR Suggest me a career in AI...")
 
+# --- Traffic stats (shared across sessions in this process) ---
+@st.cache_resource
+def get_traffic_stats():
+    return {"local": 0, "llm": 0, "local_seconds": 0.0, "llm_seconds": 0.0}
+
 # --- Action ---
 if st.button("🚀 Get Answer") and query.strip():
-    with st.spinner("Thinking with AI power..."):
-        import asyncio
-
-        # 🔁 Manual Handoff
-        selected_agent = (
-            career_agent if any(x in query.lower() for x in ["career", "job", "profession", "future"])
-            else main_agent
-        )
-
-        result = asyncio.run(
-            Runner.run(
-                input=query,
-                starting_agent=selected_agent,
-                run_config=config
+    stats = get_traffic_stats()
+    start = time.perf_counter()
+    expression = extract_expression(query)
+
+    if expression is not None:
+        # 🧮 Fast path: pure arithmetic is answered locally, no model call
+        try:
+            answer = f"Result: {evaluate(expression)}"
+        except CalculatorError as e:
+            answer = f"Error: {str(e)}"
+        stats["local"] += 1
+        stats["local_seconds"] += time.perf_counter() - start
+
+        st.markdown("### ✅ Answer")
+        st.success(answer)
+        st.caption("🧮 Computed locally, no LLM call")
+    else:
+        with st.spinner("Thinking with AI power..."):
+            # 🔁 Local intent router, falling back to model handoff when unsure
+            route, confidence = router.route(query)
+            selected_agent = {"career": career_agent, "math": main_agent}.get(route, triage_agent)
+
+            result = run_async(
+                Runner.run(
+                    input=query,
+                    starting_agent=selected_agent,
+                    run_config=config
+                )
             )
-        )
+        stats["llm"] += 1
+        stats["llm_seconds"] += time.perf_counter() - start
 
         # --- Output ---
         st.markdown("### ✅ AI Response")
         st.success(result.final_output)
+        st.caption(f"🧭 Routed to {selected_agent.name} ({confidence:.0%} confidence)")
+
+    total = stats["local"] + stats["llm"]
+    local_ms = stats["local_seconds"] / stats["local"] * 1000 if stats["local"] else 0.0
+    llm_ms = stats["llm_seconds"] / stats["llm"] * 1000 if stats["llm"] else 0.0
+    st.caption(f"📊 {stats['local'] / total:.0%} of {total} queries served without an LLM call · "
+               f"avg {local_ms:.2f} ms local vs {llm_ms:.0f} ms via LLM")
 
 # --- Footer ---
 st.markdown("---")
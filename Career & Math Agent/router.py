@@ -0,0 +1,142 @@
+import math
+import os
+import random
+import re
+import zlib
+
+# --- Hashed n-gram features + softmax regression, trained at import (a few ms) ---
+DIMENSIONS = 2 ** 12
+CONFIDENCE_THRESHOLD = float(os.getenv("ROUTER_THRESHOLD", "0.75"))
+
+TOKEN_RE = re.compile(r"[a-z]+|\d+(?:\.\d+)?|[-+*/^()%=]")
+
+TRAINING_EXAMPLES = [
+    # career
+    ("career", "suggest me a career in ai"),
+    ("career", "what career should i choose after computer science"),
+    ("career", "how do i become a data scientist"),
+    ("career", "is software engineering a good job for the future"),
+    ("career", "which profession pays well and has growth"),
+    ("career", "i am confused about my future, what field should i study"),
+    ("career", "how can i switch jobs from teaching to marketing"),
+    ("career", "what skills do i need to get hired as a web developer"),
+    ("career", "should i do a masters or start working"),
+    ("career", "how to prepare for a job interview"),
+    ("career", "what are the best careers for creative people"),
+    ("career", "give me advice on choosing between medicine and engineering"),
+    ("career", "how do i write a good resume"),
+    ("career", "what jobs can i get with a business degree"),
+    ("career", "is freelancing better than a full time job"),
+    ("career", "how to grow in my current role and get promoted"),
+    ("career", "which certifications help in a cloud computing career"),
+    ("career", "what does a product manager do"),
+    ("career", "can you guide me to become a doctor"),
+    ("career", "what is the future of jobs in artificial intelligence"),
+    ("career", "how much do accountants earn and is it a good path"),
+    ("career", "i like biology, which professions suit me"),
+    ("career", "tips for my first internship"),
+    ("career", "how to negotiate salary for a new job offer"),
+    # math
+    ("math", "what is (5 * 3) + 2"),
+    ("math", "calculate 25 * 4"),
+    ("math", "solve 12 / 4 + 7"),
+    ("math", "what is the square root of 144"),
+    ("math", "what is the future value of 5*3"),
+    ("math", "compute 2 ^ 10"),
+    ("math", "how much is 15 percent of 200"),
+    ("math", "what is 7 plus 8"),
+    ("math", "multiply 13 by 17"),
+    ("math", "divide 100 by 8"),
+    ("math", "what is 3.5 * 2 - 1"),
+    ("math", "evaluate sqrt(81) + 3"),
+    ("math", "find the sum of 45 and 55"),
+    ("math", "what is 10 minus 3 times 2"),
+    ("math", "calculate the area of a circle with radius 3"),
+    ("math", "what is 2 to the power of 8"),
+    ("math", "what is 1000 divided by 25"),
+    ("math", "solve (8 + 2) * (3 - 1)"),
+    ("math", "how much is 250 * 12"),
+    ("math", "what is the value of pi times 4"),
+    ("math", "factorial of 6"),
+    ("math", "compute 99 % 7"),
+    ("math", "what is 45 / 9"),
+    ("math", "add 123 and 456"),
+    # other: greetings and off-topic chat, left to the triage agent
+    ("other", "hello"),
+    ("other", "hi there"),
+    ("other", "hey, how are you"),
+    ("other", "good morning"),
+    ("other", "thanks a lot"),
+    ("other", "who are you"),
+    ("other", "what can you do"),
+    ("other", "tell me a joke"),
+    ("other", "what is the weather like today"),
+    ("other", "recommend a good movie"),
+    ("other", "write a poem about the sea"),
+    ("other", "what is the capital of france"),
+    ("other", "translate good night into spanish"),
+    ("other", "who won the football match yesterday"),
+    ("other", "give me a recipe for pancakes"),
+    ("other", "ok"),
+    ("other", "bye"),
+    ("other", "test"),
+]
+
+LABELS = ["career", "math", "other"]
+
+
+def features(text: str) -> dict[int, float]:
+    """Hash word unigrams, bigrams and character trigrams into a sparse, L2-normalized vector."""
+    tokens = ["<num>" if t[0].isdigit() else t for t in TOKEN_RE.findall(text.lower())]
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    for token in tokens:
+        padded = f"#{token}#"
+        grams += [padded[i:i + 3] for i in range(len(padded) - 2)]
+    vector: dict[int, float] = {}
+    for gram in grams:
+        index = zlib.crc32(gram.encode()) % DIMENSIONS
+        vector[index] = vector.get(index, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+    return {i: v / norm for i, v in vector.items()}
+
+
+class IntentRouter:
+    """Softmax regression over hashed n-grams: P(label) for career, math and other."""
+
+    def __init__(self, examples=TRAINING_EXAMPLES, epochs: int = 40, learning_rate: float = 0.5,
+                 l2: float = 1e-4, seed: int = 13):
+        self.weights = {label: [0.0] * DIMENSIONS for label in LABELS}
+        self.bias = {label: 0.0 for label in LABELS}
+        rows = [(features(text), label) for label, text in examples]
+        rng = random.Random(seed)
+        for _ in range(epochs):
+            rng.shuffle(rows)
+            for x, y in rows:
+                probabilities = self._probabilities(x)
+                for label in LABELS:
+                    error = probabilities[label] - (1.0 if label == y else 0.0)
+                    weights = self.weights[label]
+                    for i, v in x.items():
+                        weights[i] -= learning_rate * (error * v + l2 * weights[i])
+                    self.bias[label] -= learning_rate * error
+
+    def _probabilities(self, x: dict[int, float]) -> dict[str, float]:
+        scores = {label: self.bias[label] + sum(self.weights[label][i] * v for i, v in x.items())
+                  for label in LABELS}
+        top = max(scores.values())
+        exps = {label: math.exp(score - top) for label, score in scores.items()}
+        total = sum(exps.values())
+        return {label: e / total for label, e in exps.items()}
+
+    def predict(self, text: str) -> tuple[str, float]:
+        probabilities = self._probabilities(features(text))
+        label = max(probabilities, key=probabilities.get)
+        return label, probabilities[label]
+
+    def route(self, text: str, threshold: float = CONFIDENCE_THRESHOLD) -> tuple[str | None, float]:
+        """(label, confidence), with label None when the model is unsure or the query is neither career nor math."""
+        label, confidence = self.predict(text)
+        return (label if label != "other" and confidence >= threshold else None), confidence
+
+
+router = IntentRouter()
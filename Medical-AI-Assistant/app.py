@@ -1,9 +1,14 @@
 import streamlit as st
 st.set_page_config(page_title="🩺 AI Medical Assistant🤖", page_icon=":robot:", layout="wide")
 
+import os
+import time
+import uuid
 from pathlib import Path
 import google.generativeai as genai
 from google.generativeai import types
+from sessions import ChatSessionPool
+from imageprep import IMAGE_FORMAT, MAX_EDGE, prepare_dicom, prepare_image
 api_key = st.secrets["GOOGLE_API_KEY"]
 
 # Custom CSS for professional medical styling
@@ -44,8 +49,11 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-#configure api key
-genai.configure(api_key = api_key)
+#configure api key (GEMINI_API_ENDPOINT points the REST transport at another server, e.g. a local fake)
+if os.getenv("GEMINI_API_ENDPOINT"):
+    genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": os.getenv("GEMINI_API_ENDPOINT")})
+else:
+    genai.configure(api_key = api_key)
 
 generation_config = {
   "temperature": 1,
@@ -55,11 +63,6 @@ generation_config = {
   "response_mime_type": "text/plain",
 }
 
-model = genai.GenerativeModel(
-  model_name="gemini-1.5-pro",
-  generation_config=generation_config,
-)
-
 system_prompt = """You are a professional medical AI assistant with expertise in analyzing medical images and providing detailed medical insights. Your role is to:
 1. Analyze medical images with high accuracy and attention to detail
 2. Provide clear, professional medical observations
@@ -70,12 +73,30 @@ system_prompt = """You are a professional medical AI assistant with expertise in
 
 Please analyze the provided medical image and provide your insights."""
 
-chat_session = model.start_chat(
-  history=[
-    {"role": "user", "parts": system_prompt},
-    {"role": "model", "parts": "I understand my role as a medical AI assistant. I will analyze medical images professionally while maintaining ethical standards and providing clear, detailed insights. I will always remind users that my analysis should complement, not replace, professional medical opinions."}
-  ]
-)
+# One model and one pool of per-user chats per process. The system prompt is
+# sent as system_instruction instead of being replayed as chat history.
+@st.cache_resource
+def get_session_pool():
+    model = genai.GenerativeModel(
+      model_name="gemini-1.5-pro",
+      generation_config=generation_config,
+      system_instruction=system_prompt,
+    )
+    return ChatSessionPool(model)
+
+# Downscale and re-encode once per upload and setting, not on every rerun
+@st.cache_data(max_entries=16, show_spinner=False)
+def prepare_upload(data, name, max_edge, fmt):
+    start = time.perf_counter()
+    if name.lower().endswith(".dcm"):
+        prepared = prepare_dicom(data, max_edge=max_edge)
+    else:
+        prepared = prepare_image(data, max_edge=max_edge, fmt=fmt)
+    return prepared, time.perf_counter() - start
+
+session_pool = get_session_pool()
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = uuid.uuid4().hex
 
 # Header Section with columns for centering
 col1, col2, col3 = st.columns([1,2,1])
@@ -89,24 +110,33 @@ with st.container():
     with col2:
         st.markdown("<div class='upload-section'>", unsafe_allow_html=True)
         st.markdown("### 📤 Upload Medical Image")
-        st.markdown("Support formats: JPEG, PNG, JPG")
-        uploaded_file = st.file_uploader("", type=["jpg", "png", "jpeg"])
-        
+        st.markdown("Support formats: JPEG, PNG, JPG, DICOM (.dcm)")
+        uploaded_file = st.file_uploader("", type=["jpg", "png", "jpeg", "dcm"])
+
+        with st.expander("⚙️ Upload settings"):
+            max_edge = st.slider("Longest image side sent to the model (px)", 512, 3072, MAX_EDGE, step=128)
+            image_format = st.selectbox("Upload format", ["JPEG", "WEBP"], index=["JPEG", "WEBP"].index(IMAGE_FORMAT.upper()))
+
+        prepared = None
         if uploaded_file:
-            st.image(uploaded_file, caption="Uploaded Image", use_container_width=True)
+            try:
+                prepared, prep_seconds = prepare_upload(uploaded_file.getvalue(), uploaded_file.name, max_edge, image_format)
+            except Exception as e:
+                st.error(f"⚠️ Could not read this image: {e}")
+        if prepared:
+            st.image(prepared.data, caption="Uploaded Image", use_container_width=True)
+            st.caption(f"📦 {prepared.original_bytes / 1024:,.0f} KB → {len(prepared.data) / 1024:,.0f} KB "
+                       f"({prepared.size[0]}×{prepared.size[1]}, prepared in {prep_seconds * 1000:.0f} ms)")
             
         if st.button("Generate the Analysis..."):
-            if uploaded_file is not None:
+            if prepared is not None:
                 with st.spinner('Analyzing image... Please wait.'):
-                    image_data = uploaded_file.getvalue()
-                    response = chat_session.send_message(
-                        {
-                            "role": "user",
-                            "parts": [
-                                {"text": "Please analyze this medical image:"},
-                                {"inline_data": {"mime_type": uploaded_file.type, "data": image_data}}
-                            ]
-                        }
+                    response = session_pool.send(
+                        st.session_state["session_id"],
+                        [
+                            {"text": "Please analyze this medical image:"},
+                            {"inline_data": prepared.blob}
+                        ]
                     )
                     st.markdown("<div style='background-color: white; padding: 2rem; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>", unsafe_allow_html=True)
                     st.markdown("### 📋 Analysis Results")
@@ -0,0 +1,87 @@
+"""
+Per-request prompt tokens, upload size and latency over consecutive
+analyses: the old single module-level chat (system prompt replayed as
+history, unbounded) vs the session pool (system_instruction, bounded
+history), against the local fake Gemini endpoint:
+
+    python bench_sessions.py --analyses 50
+"""
+import argparse
+import io
+import os
+import statistics
+import time
+import warnings
+
+from PIL import Image
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+import google.generativeai as genai  # noqa: E402
+
+from fake_gemini import start_fake_gemini  # noqa: E402
+from sessions import ChatSessionPool  # noqa: E402
+
+SYSTEM_PROMPT = """You are a professional medical AI assistant with expertise in analyzing medical images and providing detailed medical insights. Your role is to:
+1. Analyze medical images with high accuracy and attention to detail
+2. Provide clear, professional medical observations
+3. Highlight any concerning findings that require attention
+4. Use medical terminology appropriately while ensuring explanations are understandable
+5. Maintain patient confidentiality and medical ethics
+6. Remind users that your analysis should not replace professional medical opinions
+
+Please analyze the provided medical image and provide your insights."""
+
+ACK = ("I understand my role as a medical AI assistant. I will analyze medical images professionally while "
+       "maintaining ethical standards and providing clear, detailed insights. I will always remind users that "
+       "my analysis should complement, not replace, professional medical opinions.")
+
+
+def sample_image(seed: int) -> bytes:
+    image = Image.effect_noise((640, 480), 40 + seed % 20).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def message(image: bytes) -> list[dict]:
+    return [{"text": "Please analyze this medical image:"},
+            {"inline_data": {"mime_type": "image/jpeg", "data": image}}]
+
+
+def run(label, send, images, server):
+    tokens, latencies = [], []
+    bytes_before = server.stats.get("request_bytes", 0)
+    for image in images:
+        start = time.perf_counter()
+        response = send(message(image))
+        latencies.append(time.perf_counter() - start)
+        tokens.append(response.usage_metadata.prompt_token_count)
+    upload = server.stats["request_bytes"] - bytes_before
+    print(f"{label:<8} prompt tokens first={tokens[0]:6d} 10th={tokens[9]:6d} last={tokens[-1]:6d} "
+          f"total={sum(tokens):8d}  upload={upload / 1e6:7.1f} MB  "
+          f"latency p50={statistics.median(latencies) * 1000:6.0f} ms last={latencies[-1] * 1000:6.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--analyses", type=int, default=50)
+    args = parser.parse_args()
+
+    server = start_fake_gemini(delay=0.02, prefill_ms=20)
+    genai.configure(api_key="fake", transport="rest",
+                    client_options={"api_endpoint": f"http://127.0.0.1:{server.server_port}"})
+    images = [sample_image(i) for i in range(args.analyses)]
+    print(f"{args.analyses} analyses of {len(images[0]) / 1024:.0f} KB images")
+
+    old_model = genai.GenerativeModel("gemini-1.5-pro")
+    old_chat = old_model.start_chat(history=[{"role": "user", "parts": SYSTEM_PROMPT},
+                                             {"role": "model", "parts": ACK}])
+    run("old", lambda content: old_chat.send_message({"role": "user", "parts": content}), images, server)
+
+    pool = ChatSessionPool(genai.GenerativeModel("gemini-1.5-pro", system_instruction=SYSTEM_PROMPT))
+    session_id = os.urandom(8).hex()
+    run("pool", lambda content: pool.send(session_id, content), images, server)
+
+
+if __name__ == "__main__":
+    main()
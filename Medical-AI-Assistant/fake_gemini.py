@@ -0,0 +1,98 @@
+"""
+Minimal Gemini REST generateContent endpoint for offline runs.
+
+Prompt tokens are estimated the way Gemini bills them: about 4 characters
+per text token and a flat 258 tokens per image. Latency is `delay` plus
+`prefill_ms` per 1000 prompt tokens, so longer histories answer slower,
+plus the upload time of the request body at `upload_mbps` when set.
+The server keeps request/token/byte totals in `server.stats`.
+
+    python fake_gemini.py --port 8766
+    GEMINI_API_ENDPOINT=http://127.0.0.1:8766 streamlit run app.py
+"""
+import argparse
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+IMAGE_TOKENS = 258
+REPLY = ("Findings: the image shows normal anatomical structures with no acute abnormality. "
+         "Impression: no urgent findings; correlate clinically and consult a radiologist. ")
+
+
+def count_tokens(contents: list[dict]) -> int:
+    tokens = 0
+    for content in contents:
+        for part in content.get("parts", []):
+            if "text" in part:
+                tokens += math.ceil(len(part["text"]) / 4)
+            elif "inlineData" in part:
+                tokens += IMAGE_TOKENS
+    return tokens
+
+
+def make_handler(delay: float, prefill_ms: float, reply: str, stats: dict, upload_mbps: float = 0.0):
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            system = request.get("systemInstruction")
+            prompt_tokens = count_tokens(request.get("contents", []) + ([system] if system else []))
+            output_tokens = math.ceil(len(reply) / 4)
+            upload = length * 8 / (upload_mbps * 1e6) if upload_mbps else 0.0
+            time.sleep(delay + prefill_ms * prompt_tokens / 1000 / 1000 + upload)
+            with lock:
+                stats["requests"] = stats.get("requests", 0) + 1
+                stats["prompt_tokens"] = stats.get("prompt_tokens", 0) + prompt_tokens
+                stats["request_bytes"] = stats.get("request_bytes", 0) + length
+            body = json.dumps({
+                "candidates": [{
+                    "content": {"role": "model", "parts": [{"text": reply}]},
+                    "finishReason": "STOP",
+                    "index": 0,
+                }],
+                "usageMetadata": {
+                    "promptTokenCount": prompt_tokens,
+                    "candidatesTokenCount": output_tokens,
+                    "totalTokenCount": prompt_tokens + output_tokens,
+                },
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_fake_gemini(delay: float = 0.05, port: int = 0, prefill_ms: float = 20.0,
+                      reply: str = REPLY, upload_mbps: float = 0.0) -> ThreadingHTTPServer:
+    stats = {}
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(delay, prefill_ms, reply, stats, upload_mbps))
+    server.stats = stats
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--prefill-ms", type=float, default=20.0, help="extra latency per 1000 prompt tokens")
+    parser.add_argument("--upload-mbps", type=float, default=0.0, help="simulated uplink bandwidth (0 = unlimited)")
+    args = parser.parse_args()
+    server = start_fake_gemini(args.delay, args.port, args.prefill_ms, upload_mbps=args.upload_mbps)
+    print(f"Fake Gemini endpoint on http://127.0.0.1:{server.server_port}")
+    threading.Event().wait()
@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+MAX_SESSIONS = int(os.getenv("MAX_CHAT_SESSIONS", "200"))
+IDLE_TTL = float(os.getenv("CHAT_IDLE_TTL", "1800"))  # seconds before an unused session is dropped
+MAX_TURNS = int(os.getenv("CHAT_MAX_TURNS", "4"))     # user/model exchanges kept as context
+KEEP_IMAGES = int(os.getenv("CHAT_KEEP_IMAGES", "1"))  # most recent turns that keep their image bytes
+
+IMAGE_PLACEHOLDER = "[previously analyzed image omitted]"
+
+
+def trim_history(history, max_turns: int = MAX_TURNS, keep_images: int = KEEP_IMAGES) -> list[dict]:
+    """
+    Sliding window over a chat history: keep the last `max_turns` exchanges
+    and swap images older than the last `keep_images` user turns for a short
+    text placeholder, so each new request doesn't re-upload every past scan.
+    """
+    history = list(history)[-2 * max_turns:] if max_turns > 0 else []
+    user_turns = [i for i, content in enumerate(history) if content.role == "user"]
+    if not keep_images:
+        keep_from = len(history)
+    elif len(user_turns) >= keep_images:
+        keep_from = user_turns[-keep_images]
+    else:
+        keep_from = 0  # fewer user turns than images to keep: keep them all
+    trimmed = []
+    for i, content in enumerate(history):
+        parts = []
+        for part in content.parts:
+            if part.inline_data.mime_type and i < keep_from:
+                parts.append({"text": IMAGE_PLACEHOLDER})
+            elif part.inline_data.mime_type:
+                parts.append({"inline_data": {"mime_type": part.inline_data.mime_type, "data": part.inline_data.data}})
+            else:
+                parts.append({"text": part.text})
+        trimmed.append({"role": content.role, "parts": parts})
+    return trimmed
+
+
+class ChatSessionPool:
+    """
+    One Gemini chat per user, held in an LRU with idle eviction.
+
+    The system prompt lives in the model's system_instruction, so sessions
+    start with an empty history; every send trims the history back to a
+    bounded window.
+    """
+
+    def __init__(self, model, max_sessions: int = MAX_SESSIONS, idle_ttl: float = IDLE_TTL,
+                 max_turns: int = MAX_TURNS, keep_images: int = KEEP_IMAGES):
+        self.model = model
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_turns = max_turns
+        self.keep_images = keep_images
+        self._sessions: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evicted = 0
+
+    def _evict(self, now: float):
+        while self._sessions:
+            key, (last_used, _) = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - last_used < self.idle_ttl:
+                break
+            del self._sessions[key]
+            self.evicted += 1
+
+    def get(self, session_id: str):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is None:
+                chat = self.model.start_chat()
+                self.created += 1
+            else:
+                chat = entry[1]
+            self._sessions[session_id] = (now, chat)
+            self._evict(now)
+            return chat
+
+    def send(self, session_id: str, content):
+        chat = self.get(session_id)
+        response = chat.send_message(content)
+        chat.history = trim_history(chat.history, self.max_turns, self.keep_images)
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"live": len(self._sessions), "created": self.created, "evicted": self.evicted}
@@ -0,0 +1,125 @@
+"""
+Many threads hammering a local stub that enforces Binance-style request
+weight limits (fixed window, 429 with Retry-After, 418 ban for callers that
+ignore it). Raw requests.get (old) vs the rate-limit-aware BinanceClient:
+
+    python bench_client.py --threads 16 --requests 30 --limit 200 --window 1
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from binance_client import BinanceClient
+
+
+def start_limited_server(limit: int, window: float, ban_after: int = 5, ban_seconds: float = 3.0):
+    """Stub /api/v3/ticker/price enforcing `limit` weight per `window` seconds."""
+    state = {"window_start": time.monotonic(), "used": 0, "rejected": 0, "banned_until": 0.0,
+             "ok": 0, "429": 0, "418": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            weight = 2 if "symbol=" in self.path else 4
+            with lock:
+                now = time.monotonic()
+                if now - state["window_start"] >= window:
+                    state.update(window_start=now, used=0, rejected=0)
+                retry_after = window - (now - state["window_start"])
+                if now < state["banned_until"]:
+                    status, retry_after = 418, state["banned_until"] - now
+                elif state["used"] + weight > limit:
+                    state["rejected"] += 1
+                    status = 429
+                    if state["rejected"] > ban_after:  # kept hammering after being told to stop
+                        state["banned_until"] = now + ban_seconds
+                        status, retry_after = 418, ban_seconds
+                else:
+                    state["used"] += weight
+                    status = 200
+                state["ok" if status == 200 else str(status)] += 1
+                used = state["used"]
+            body = json.dumps({"symbol": "BTCUSDT", "price": "65000.00"} if status == 200 else {"code": -1003}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("X-MBX-USED-WEIGHT-1M", str(used))
+            if status != 200:
+                self.send_header("Retry-After", str(max(1, round(retry_after))))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(label, call, threads, per_thread):
+    latencies, failures = [], 0
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal failures
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            try:
+                call()
+                ok = True
+            except requests.exceptions.RequestException:
+                ok = False
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                failures += not ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        for _ in range(threads):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{label:<8} ok={len(latencies) - failures:4d} failed={failures:4d}  {elapsed:6.2f} s  "
+          f"p50={statistics.median(latencies) * 1000:7.1f} ms  p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=30, help="requests per thread")
+    parser.add_argument("--limit", type=int, default=200, help="weight allowed per window")
+    parser.add_argument("--window", type=float, default=1.0, help="seconds")
+    args = parser.parse_args()
+
+    for label in ("raw", "client"):
+        server = start_limited_server(args.limit, args.window)
+        base = f"http://127.0.0.1:{server.server_port}"
+        if label == "raw":
+            def call():
+                response = requests.get(f"{base}/api/v3/ticker/price", params={"symbol": "BTCUSDT"})
+                response.raise_for_status()
+                return response.json()
+        else:
+            client = BinanceClient(base, weight_limit=args.limit, window=args.window, max_wait=30)
+            def call():
+                return client.get_json("/api/v3/ticker/price", {"symbol": "BTCUSDT"})
+        run(label, call, args.threads, args.requests)
+        state = server.state
+        print(f"         server saw 200={state['ok']} 429={state['429']} 418={state['418']}"
+              + (f"  client stats={client.stats()}" if label == "client" else ""))
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
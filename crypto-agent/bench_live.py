@@ -0,0 +1,47 @@
+"""
+Update lag of the live price table fed through a real WebSocket from the
+local replay server (recorded ticks, timestamps rebased to send time):
+
+    python bench_live.py --ticks ticks_sample.jsonl --speed 1 10 100
+"""
+import argparse
+import asyncio
+import time
+
+from live import LivePriceTable, websocket_feed
+from replay_server import load_ticks, start_replay_server
+
+
+async def measure(records, speed: float):
+    server = await start_replay_server(records, speed=speed)
+    port = next(iter(server.sockets)).getsockname()[1]
+    table = LivePriceTable(lag_window=100_000)
+    start = time.perf_counter()
+    task = asyncio.create_task(table.follow(websocket_feed(f"ws://127.0.0.1:{port}")))
+    while table.messages < len(records):
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    server.close()
+    await server.wait_closed()
+    return table, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", default="ticks_sample.jsonl")
+    parser.add_argument("--speed", type=float, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    records = load_ticks(args.ticks)
+    for speed in args.speed:
+        table, elapsed = await measure(records, speed)
+        lag = table.lag()
+        print(f"speed x{speed:<5g} messages={table.messages:4d} ticks={table.ticks:5d} "
+              f"ticks/s={table.ticks / elapsed:8.0f}  lag p50={lag['p50_ms']} ms  p99={lag['p99_ms']} ms  "
+              f"max={lag['max_ms']} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
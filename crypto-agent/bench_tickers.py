@@ -0,0 +1,125 @@
+"""
+Per-symbol price lookups: one HTTP call each (old) vs the shared snapshot,
+against a local stub serving a Binance-sized ticker list, then top-N
+ranking with heapq.nlargest vs a full sort:
+
+    python bench_tickers.py --symbols 3000 --lookups 200 --top 10
+"""
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from binance_client import BinanceClient
+from tickers import DailyStats, TickerCache
+
+
+def start_stub_server(n_symbols: int, delay: float):
+    data = [{"symbol": f"COIN{i}USDT", "price": f"{random.uniform(0.01, 70000):.8f}"} for i in range(n_symbols)]
+    by_symbol = {item["symbol"]: item for item in data}
+    bulk = json.dumps(data).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(delay)
+            self.server.calls += 1
+            if "symbol=" in self.path:
+                item = by_symbol.get(self.path.split("symbol=")[1])
+                body, status = (json.dumps(item).encode(), 200) if item else (b'{"code":-1121}', 400)
+            else:
+                body, status = bulk, 200
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.calls = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, [item["symbol"] for item in data]
+
+
+def synthetic_daily(n_symbols: int) -> DailyStats:
+    quotes = ["USDT", "FDUSD", "BTC", "ETH", "TRY"]
+    return DailyStats.from_json([
+        {"symbol": f"COIN{i}{random.choice(quotes)}", "lastPrice": f"{random.uniform(0.01, 70000):.8f}",
+         "priceChangePercent": f"{random.uniform(-30, 30):.3f}", "quoteVolume": f"{random.uniform(0, 1e9):.2f}"}
+        for i in range(n_symbols)
+    ])
+
+
+def full_sort_top(daily: DailyStats, n: int, by: str, quote: str) -> list[str]:
+    values = getattr(daily, by)
+    rows = [i for i, s in enumerate(daily.symbols) if daily.quote_volume[i] > 0 and s.endswith(quote)]
+    return [daily.symbols[i] for i in sorted(rows, key=values.__getitem__, reverse=True)[:n]]
+
+
+def bench_ranking(n_symbols: int, top: int, runs: int = 50):
+    daily = synthetic_daily(n_symbols)
+    for by in ("quote_volume", "change", "price"):
+        heap = [coin["symbol"] for coin in daily.top(top, by, "USDT")]
+        assert heap == full_sort_top(daily, top, by, "USDT")
+        start = time.perf_counter()
+        for _ in range(runs):
+            daily.top(top, by, "USDT")
+        heap_ms = (time.perf_counter() - start) / runs * 1000
+        start = time.perf_counter()
+        for _ in range(runs):
+            full_sort_top(daily, top, by, "USDT")
+        sort_ms = (time.perf_counter() - start) / runs * 1000
+        print(f"top {top} of {n_symbols} by {by:<12}  heapq={heap_ms:6.3f} ms  full sort={sort_ms:6.3f} ms")
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples) * 1000, samples[int(len(samples) * 0.99) - 1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=3000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.02, help="simulated network latency per request")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    server, symbols = start_stub_server(args.symbols, args.delay)
+    base = f"http://127.0.0.1:{server.server_port}"
+    wanted = [random.choice(symbols) for _ in range(args.lookups)]
+
+    samples = []
+    for symbol in wanted:
+        start = time.perf_counter()
+        requests.get(f"{base}/api/v3/ticker/price?symbol={symbol}").json()
+        samples.append(time.perf_counter() - start)
+    calls = server.calls
+    print(f"per-symbol HTTP  p50={percentiles(samples)[0]:8.3f} ms  p99={percentiles(samples)[1]:8.3f} ms  calls={calls}")
+
+    cache = TickerCache(ttl=60, client=BinanceClient(base))
+    samples = []
+    for symbol in wanted:
+        start = time.perf_counter()
+        cache.get().price(symbol)
+        samples.append(time.perf_counter() - start)
+    print(f"snapshot         p50={percentiles(samples)[0]:8.3f} ms  p99={percentiles(samples)[1]:8.3f} ms  "
+          f"calls={server.calls - calls}  (first lookup pays the bulk fetch)")
+    server.shutdown()
+
+    for n_symbols in (args.symbols, 20 * args.symbols):
+        bench_ranking(n_symbols, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BINANCE_API_URL = os.getenv("BINANCE_API_URL", "https://api.binance.com")
+WEIGHT_LIMIT = int(os.getenv("BINANCE_WEIGHT_LIMIT", "6000"))  # REQUEST_WEIGHT per minute per IP
+WEIGHT_HEADROOM = 0.9  # leave room for other processes sharing the IP
+CONNECT_TIMEOUT = float(os.getenv("BINANCE_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("BINANCE_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("BINANCE_MAX_RETRIES", "4"))
+MAX_WAIT = float(os.getenv("BINANCE_MAX_WAIT", "60"))  # longest a caller will queue or back off
+
+# Request weight per endpoint as (with symbol, without symbol = every symbol)
+ENDPOINT_WEIGHTS = {
+    "/api/v3/ticker/price": (2, 4),
+    "/api/v3/ticker/24hr": (2, 80),
+}
+DEFAULT_WEIGHT = 1
+
+
+class BinanceError(requests.exceptions.RequestException):
+    """Raised when a request can't be completed within the rate limits."""
+
+
+class TokenBucket:
+    """
+    Request-weight budget that refills continuously over `window` seconds.
+    acquire() blocks until enough weight is available, so callers queue up
+    instead of being rejected by the exchange.
+    """
+
+    def __init__(self, capacity: float, window: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / window
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, weight: float, max_wait: float = MAX_WAIT) -> float:
+        """Take `weight` tokens, waiting if needed; returns the seconds spent waiting."""
+        weight = min(weight, self.capacity)
+        deadline = time.monotonic() + max_wait
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return time.monotonic() - start
+                wait = (weight - self.tokens) / self.rate
+                if time.monotonic() + wait > deadline:
+                    raise BinanceError(f"rate limit queue is longer than {max_wait:g}s")
+                self._cond.wait(wait)
+
+    def sync(self, used: float):
+        """The server says `used` weight is spent in its window: never believe we have more left."""
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.tokens, self.capacity - used)
+
+    def pause(self, seconds: float):
+        """Empty the bucket so nobody sends for roughly `seconds` (after a 429/418)."""
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+class BinanceClient:
+    """
+    Binance REST client shared by every session in the process: one pooled
+    HTTP session, explicit timeouts, local request-weight accounting kept in
+    sync with the X-MBX-USED-WEIGHT-1M header, and jittered exponential
+    backoff on 429 (rate limited) and 418 (IP banned).
+    """
+
+    def __init__(self, base_url: str = BINANCE_API_URL, weight_limit: int = WEIGHT_LIMIT, window: float = 60.0,
+                 max_retries: int = MAX_RETRIES, max_wait: float = MAX_WAIT, pool_size: int = 20):
+        self.base_url = base_url.rstrip("/")
+        self.bucket = TokenBucket(weight_limit * WEIGHT_HEADROOM, window)
+        self.weight_limit = weight_limit
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.requests = 0
+        self.throttled = 0
+        self.queued_seconds = 0.0
+        self.used_weight = 0
+
+    @staticmethod
+    def weight(path: str, params: dict | None = None) -> int:
+        with_symbol, without_symbol = ENDPOINT_WEIGHTS.get(path, (DEFAULT_WEIGHT, DEFAULT_WEIGHT))
+        return with_symbol if params and "symbol" in params else without_symbol
+
+    def _backoff(self, attempt: int, retry_after: str | None) -> float:
+        delay = min(self.max_wait, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.5)
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return delay
+
+    def get_json(self, path: str, params: dict | None = None):
+        weight = self.weight(path, params)
+        attempt = 0
+        while True:
+            self.queued_seconds += self.bucket.acquire(weight, self.max_wait)
+            self.requests += 1
+            response = self.session.get(f"{self.base_url}{path}", params=params,
+                                        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+
+            used = response.headers.get("X-MBX-USED-WEIGHT-1M")
+            if used is not None and used.isdigit():
+                self.used_weight = int(used)
+                self.bucket.sync(self.used_weight)
+
+            if response.status_code not in (418, 429):
+                response.raise_for_status()
+                return response.json()
+
+            self.throttled += 1
+            delay = self._backoff(attempt, response.headers.get("Retry-After"))
+            if attempt == self.max_retries or delay > self.max_wait:
+                raise BinanceError(f"Binance rate limit ({response.status_code}); retry in {delay:.0f}s",
+                                   response=response)
+            self.bucket.pause(delay)  # every caller backs off, not just this one
+            attempt += 1
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "queued_seconds": round(self.queued_seconds, 2),
+            "used_weight": self.used_weight,
+            "weight_limit": self.weight_limit,
+        }
+
+
+binance = BinanceClient()
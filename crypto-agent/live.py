@@ -0,0 +1,167 @@
+import asyncio
+import concurrent.futures
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from statistics import median
+
+from websockets.asyncio.client import connect
+from websockets.exceptions import WebSocketException
+
+# All-market mini tickers: one array per second with every symbol that changed
+BINANCE_WS_URL = os.getenv("BINANCE_WS_URL", "wss://stream.binance.com:9443/ws/!miniTicker@arr")
+STALE_AFTER = float(os.getenv("LIVE_STALE_AFTER", "15"))  # seconds without a message before falling back to REST
+IDLE_STOP = float(os.getenv("LIVE_IDLE_STOP", "30"))  # seconds without a live viewer before the stream is closed
+
+
+class LivePriceTable:
+    """
+    Latest price per symbol, kept up to date by a feed running on the
+    background event loop. Readers on Streamlit threads only do dict lookups.
+
+    Update lag is the time from the exchange's event timestamp ("E") to the
+    moment the tick is applied here.
+    """
+
+    def __init__(self, lag_window: int = 2000):
+        self.prices: dict[str, str] = {}
+        self.event_ms: dict[str, int] = {}
+        self.messages = 0
+        self.ticks = 0
+        self.last_message_at: float | None = None  # time.monotonic()
+        self.error: str | None = None
+        self._lags = deque(maxlen=lag_window)
+
+    def apply(self, message, received_ms: float | None = None):
+        """Apply one feed message: a mini-ticker dict or an array of them."""
+        received_ms = time.time() * 1000 if received_ms is None else received_ms
+        ticks = message if isinstance(message, list) else [message]
+        for tick in ticks:
+            symbol = tick["s"]
+            self.prices[symbol] = tick["c"]
+            self.event_ms[symbol] = tick["E"]
+            self._lags.append(received_ms - tick["E"])
+        self.ticks += len(ticks)
+        self.messages += 1
+        self.last_message_at = time.monotonic()
+
+    async def follow(self, feed):
+        """Consume an async iterator of messages forever (or until the feed ends)."""
+        async for message in feed:
+            try:
+                self.apply(message)
+                self.error = None
+            except (KeyError, TypeError) as e:
+                self.error = f"bad message: {e!r}"
+
+    @property
+    def fresh(self) -> bool:
+        return self.last_message_at is not None and time.monotonic() - self.last_message_at < STALE_AFTER
+
+    def price(self, symbol: str) -> str | None:
+        return self.prices.get(symbol.upper())
+
+    def lag(self) -> dict:
+        """p50 / p99 / max update lag in milliseconds over the recent window."""
+        lags = sorted(self._lags)
+        if not lags:
+            return {"p50_ms": None, "p99_ms": None, "max_ms": None}
+        return {
+            "p50_ms": round(median(lags), 1),
+            "p99_ms": round(lags[min(len(lags) - 1, int(len(lags) * 0.99))], 1),
+            "max_ms": round(lags[-1], 1),
+        }
+
+    def stats(self) -> dict:
+        return {"symbols": len(self.prices), "messages": self.messages, "ticks": self.ticks,
+                "fresh": self.fresh, "error": self.error, **self.lag()}
+
+
+# --- Feeds: async iterators of decoded messages, so the source is pluggable ---
+async def websocket_feed(url: str = BINANCE_WS_URL, max_backoff: float = 30.0):
+    """Yield messages from a ticker WebSocket, reconnecting with jittered exponential backoff."""
+    delay = 1.0
+    while True:
+        try:
+            async with connect(url, max_size=2 ** 24) as ws:
+                delay = 1.0
+                async for raw in ws:
+                    yield json.loads(raw)
+        except (OSError, WebSocketException, json.JSONDecodeError):
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+            delay = min(delay * 2, max_backoff)
+
+
+def rebase_event_time(message, now_ms: int):
+    """Rewrite event timestamps ("E") to `now_ms`, so replayed ticks measure delivery lag, not recording age."""
+    ticks = message if isinstance(message, list) else [message]
+    ticks = [{**tick, "E": now_ms} for tick in ticks]
+    return ticks if isinstance(message, list) else ticks[0]
+
+
+async def file_feed(path: str, speed: float = 1.0, loop_forever: bool = True, rebase: bool = True):
+    """Yield messages from a recorded tick file ({"t": seconds, "msg": ...} per line) at recorded pace."""
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    while records:
+        start = time.monotonic()
+        for record in records:
+            wait = record["t"] / speed - (time.monotonic() - start)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            yield rebase_event_time(record["msg"], int(time.time() * 1000)) if rebase else record["msg"]
+        if not loop_forever:
+            break
+
+
+def open_feed(source: str):
+    """ws:// or wss:// URLs are followed live; anything else is a recorded tick file replayed in-process."""
+    if source.startswith(("ws://", "wss://")):
+        return websocket_feed(source)
+    return file_feed(source)
+
+
+# --- One stream per process, closed when nobody is watching ---
+live_table = LivePriceTable()
+_started: dict[str, concurrent.futures.Future] = {}
+_wanted_at: dict[str, float] = {}  # last time a session with live mode on asked for each stream
+_start_lock = threading.Lock()
+
+
+async def _follow_while_wanted(source: str, feed, idle_stop: float):
+    task = asyncio.create_task(live_table.follow(feed(source)))
+    try:
+        while not task.done():
+            await asyncio.wait({task}, timeout=min(idle_stop, 5.0))
+            if time.monotonic() - _wanted_at[source] > idle_stop:
+                break
+    finally:
+        task.cancel()  # closes the WebSocket
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def ensure_stream(loop: asyncio.AbstractEventLoop, source: str = BINANCE_WS_URL, feed=open_feed,
+                  idle_stop: float = IDLE_STOP):
+    """
+    Start following `source` on `loop` through feed(source) unless it is
+    already running. Every session with live mode on should call this
+    regularly: the stream is closed once nobody has for `idle_stop` seconds.
+    """
+    with _start_lock:
+        _wanted_at[source] = time.monotonic()
+        running = _started.get(source)
+        if running is None or running.done():
+            _started[source] = asyncio.run_coroutine_threadsafe(
+                _follow_while_wanted(source, feed, idle_stop), loop)
+    return live_table
+
+
+def stop_stream(source: str = BINANCE_WS_URL):
+    """Close the stream for `source` now (if running)."""
+    with _start_lock:
+        running = _started.pop(source, None)
+    if running is not None:
+        running.cancel()
@@ -7,11 +7,12 @@ from dotenv import load_dotenv
 from agents import (
     Runner,
     Agent,
-    AsyncOpenAI,
-    OpenAIChatCompletionsModel,
-    RunConfig,
     function_tool
 )
+from runtime import get_loop, get_runtime
+from binance_client import binance
+from tickers import RANK_KEYS, ticker_cache
+from live import BINANCE_WS_URL, ensure_stream, live_table
 
 # Load environment variables
 load_dotenv()
@@ -20,22 +21,8 @@ if not gemini_api_key:
     st.error("GEMINI_API_KEY environment variable is not set.")
     st.stop()
 
-# Gemini-compatible model setup
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
-
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# Gemini-compatible model setup (cached across reruns)
+external_client, model, config = get_runtime(gemini_api_key, "gemini-2.0-flash")
 
 # Streamlit App Title
 st.set_page_config(page_title="Crypto Agent", page_icon="💸")
@@ -46,38 +33,48 @@ Get **real-time cryptocurrency prices** powered by **Binance API** and a Gemini-
 ---
 """)
 
-# Tool: Show top 10 crypto prices
-def show_top_prices_raw() -> str:
-    url = "https://api.binance.com/api/v3/ticker/price"
+# Tool: Show the top N coins ranked by 24h stats (answered from the shared 24h snapshot)
+def show_top_prices_raw(n: int = 10, by: str = "quote_volume", quote: str = "USDT") -> str:
+    n = max(1, min(int(n), 100))
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        top_10 = data[:10]
-        result = "📊 *Top 10 Cryptocurrency Prices*:\n\n"
-        for coin in top_10:
-            result += f"- {coin['symbol']}: *${coin['price']}*\n"
-        return result
+        top = ticker_cache.get_daily().top(n, by, quote or None)
+    except ValueError as e:
+        return f"❌ {str(e)}"
     except requests.exceptions.RequestException as e:
         return f"❌ Error: {str(e)}"
-
-# Tool: Show specific coin price
+    pairs = f"{quote.upper()} pairs" if quote else "pairs"
+    result = f"📊 *Top {n} {pairs} by {RANK_KEYS[by]}*:\n\n"
+    for coin in top:
+        price = f"{coin['price']} {quote.upper()}" if quote else coin["price"]
+        result += f"- {coin['symbol']}: *{price}* ({coin['change']:+.2f}% · vol {coin['quote_volume']:,.0f})\n"
+    return result
+
+# Tool: Show specific coin price (O(1) lookup, no network call between refreshes)
 def show_specific_coin_price_raw(symbol: str) -> str:
-    url = f"https://api.binance.com/api/v3/ticker/price?symbol={symbol.upper()}"
+    # Live mode: the WebSocket table is newer than any snapshot
+    price = live_table.price(symbol) if live_table.fresh else None
+    if price is not None:
+        return f"🔎 Current price of {symbol.upper()} is *${price}* (live)"
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            return f"🔎 Current price of {symbol.upper()} is *${data['price']}*"
-        else:
-            return f"❌ {symbol.upper()} not found. Try a correct trading pair like BTCUSDT."
+        price = ticker_cache.get().price(symbol)
     except requests.exceptions.RequestException as e:
         return f"❌ Error: {str(e)}"
+    if price is None:
+        return f"❌ {symbol.upper()} not found. Try a correct trading pair like BTCUSDT."
+    return f"🔎 Current price of {symbol.upper()} is *${price}*"
 
 # Decorated tool functions (not used directly in UI)
 @function_tool
-def show_top_prices(dummy: str = "") -> str:
-    return show_top_prices_raw()
+def show_top_prices(n: int = 10, by: str = "quote_volume", quote: str = "USDT") -> str:
+    """
+    Rank coins by their rolling 24h stats.
+
+    Args:
+        n: how many coins to list (1-100).
+        by: "quote_volume" (most traded), "change" (biggest % gainers) or "price".
+        quote: only pairs quoted in this asset, e.g. "USDT"; empty for every pair.
+    """
+    return show_top_prices_raw(n, by, quote)
 
 @function_tool
 def show_specific_coin_price(symbol: str) -> str:
@@ -88,7 +85,7 @@ crypto_agent = Agent(
     name="💸 Crypto Agent",
     instructions="""
 You are a smart crypto expert. Help users:
-- View top 10 coin prices
+- View the top coins by 24h trading volume, % change or price
 - Get prices of coins like BTCUSDT or ETHUSDT
 Respond simply and clearly. Use tools when needed.
 """,
@@ -96,17 +93,47 @@ Respond simply and clearly. Use tools when needed.
 )
 
 # Main UI
+live_mode = st.toggle("⚡ Live stream mode (Binance WebSocket)")
+
 col1, col2 = st.columns(2)
 
 with col1:
-    if st.button("📊 Show Top 10 Coins"):
-        st.markdown(show_top_prices_raw())
+    top_n = st.number_input("How many coins", min_value=1, max_value=100, value=10)
+    rank_by = st.selectbox("Rank by", list(RANK_KEYS), format_func=RANK_KEYS.get)
+    quote_asset = st.selectbox("Quote asset", ["USDT", "FDUSD", "BTC", "ETH", "All"])
+    if st.button("📊 Show Top Coins"):
+        st.markdown(show_top_prices_raw(top_n, rank_by, "" if quote_asset == "All" else quote_asset))
 
 with col2:
     coin = st.text_input("🔎 Enter trading pair (e.g. BTCUSDT, ETHUSDT)")
     if st.button("Get Price") and coin:
         st.markdown(show_specific_coin_price_raw(coin))
 
+# Live view: re-rendered every second from the in-memory table, without a REST call.
+# Each run also renews this session's claim on the stream; once no session has
+# live mode on, the WebSocket is closed after LIVE_IDLE_STOP seconds.
+@st.fragment(run_every=1)
+def live_view(symbol: str):
+    ensure_stream(get_loop(), BINANCE_WS_URL)
+    stats = live_table.stats()
+    if not stats["fresh"]:
+        st.info("⏳ Waiting for the live feed...")
+        return
+    if symbol:
+        price = live_table.price(symbol)
+        st.metric(f"{symbol.upper()} (live)", f"${price}" if price else "not in feed")
+    st.caption(f"📡 {stats['symbols']} symbols · {stats['messages']} updates · "
+               f"lag p50 {stats['p50_ms']} ms, p99 {stats['p99_ms']} ms")
+
+if live_mode:
+    live_view(coin)
+
+stats = ticker_cache.stats()
+if stats["symbols"]:
+    st.caption(f"⚡ {stats['symbols']} prices from one snapshot, {stats['age_seconds']}s old · "
+               f"{stats['lookups']} lookups, {stats['upstream_calls']} Binance calls · "
+               f"weight {binance.used_weight}/{binance.weight_limit} per min")
+
 # Footer
 st.markdown("---")
 st.markdown("Created by **Sikandar Tahir** | Powered by Binance API and Gemini")
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Local stand-in for the Binance ticker WebSocket.
+
+Record the real feed, then replay it to the app (or a benchmark):
+
+    python replay_server.py record ticks.jsonl --seconds 60
+    python replay_server.py serve ticks_sample.jsonl --port 8765 --speed 1
+    BINANCE_WS_URL=ws://127.0.0.1:8765 streamlit run main.py
+
+Event timestamps ("E") are rewritten to the send time by default, so the
+lag reported by the app measures delivery and processing, not the age of
+the recording.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from websockets.asyncio.client import connect
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+from live import BINANCE_WS_URL, rebase_event_time
+
+
+def load_ticks(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+async def replay(ws, records: list[dict], speed: float, loop_forever: bool, rebase: bool):
+    try:
+        await _send_all(ws, records, speed, loop_forever, rebase)
+    except ConnectionClosed:
+        pass  # client went away
+
+
+async def _send_all(ws, records, speed, loop_forever, rebase):
+    while True:
+        start = time.monotonic()
+        for record in records:
+            wait = record["t"] / speed - (time.monotonic() - start)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            message = rebase_event_time(record["msg"], int(time.time() * 1000)) if rebase else record["msg"]
+            await ws.send(json.dumps(message))
+        if not loop_forever:
+            break
+
+
+async def start_replay_server(records: list[dict], host: str = "127.0.0.1", port: int = 0,
+                              speed: float = 1.0, loop_forever: bool = True, rebase: bool = True):
+    """Start serving `records` to every client that connects; returns the websockets Server."""
+    return await serve(lambda ws: replay(ws, records, speed, loop_forever, rebase), host, port)
+
+
+async def record(path: str, seconds: float, url: str = BINANCE_WS_URL):
+    start = time.monotonic()
+    count = 0
+    async with connect(url, max_size=2 ** 24) as ws:
+        with open(path, "w", encoding="utf-8") as f:
+            while (remaining := seconds - (time.monotonic() - start)) > 0:
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                f.write(json.dumps({"t": round(time.monotonic() - start, 3), "msg": json.loads(raw)}) + "\n")
+                count += 1
+    print(f"recorded {count} messages to {path}")
+
+
+async def serve_forever(args):
+    server = await start_replay_server(load_ticks(args.path), args.host, args.port, args.speed,
+                                       loop_forever=not args.once, rebase=not args.keep_time)
+    print(f"replaying {args.path} on ws://{args.host}:{args.port}")
+    await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+    rec = commands.add_parser("record")
+    rec.add_argument("path")
+    rec.add_argument("--seconds", type=float, default=60)
+    srv = commands.add_parser("serve")
+    srv.add_argument("path")
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8765)
+    srv.add_argument("--speed", type=float, default=1.0)
+    srv.add_argument("--once", action="store_true", help="stop after one pass instead of looping")
+    srv.add_argument("--keep-time", action="store_true", help="send the recorded event timestamps unchanged")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        asyncio.run(record(args.path, args.seconds))
+    else:
+        asyncio.run(serve_forever(args))
+
+
+if __name__ == "__main__":
+    main()
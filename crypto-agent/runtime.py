@@ -0,0 +1,50 @@
+import asyncio
+import os
+import threading
+
+import streamlit as st
+from agents import AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+
+
+# --- One background event loop per process ---
+# Streamlit re-executes the script on every interaction; st.cache_resource
+# keeps these objects alive across reruns so the loop (and the HTTP
+# connection pool bound to it) is created only once.
+@st.cache_resource
+def get_loop() -> asyncio.AbstractEventLoop:
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="agent-runtime", daemon=True).start()
+    return loop
+
+
+@st.cache_resource
+def get_runtime(api_key: str, model_name: str, base_url: str | None = None):
+    """Cached (client, model, config) for this process."""
+    base_url = base_url or os.getenv("GEMINI_BASE_URL", DEFAULT_BASE_URL)
+    client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+    model = OpenAIChatCompletionsModel(model=model_name, openai_client=client)
+    config = RunConfig(model=model, model_provider=client, tracing_disabled=True)
+    return client, model, config
+
+
+def run_async(coro, timeout: float | None = None):
+    """Run a coroutine (e.g. Runner.run(...)) on the shared loop and wait for it."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result(timeout)
+
+
+def iter_async(agen):
+    """
+    Iterate an async generator on the shared loop from the script thread,
+    so Streamlit elements can be updated between items.
+    """
+    loop = get_loop()
+    try:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(agen.__anext__(), loop).result()
+            except StopAsyncIteration:
+                return
+    finally:
+        asyncio.run_coroutine_threadsafe(agen.aclose(), loop).result()
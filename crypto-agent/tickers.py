@@ -0,0 +1,190 @@
+import heapq
+import os
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+
+from binance_client import BinanceClient, binance
+
+TICKER_TTL = float(os.getenv("TICKER_TTL", "10"))  # seconds a price snapshot is served before refetching
+STATS_TTL = float(os.getenv("STATS_TTL", "30"))  # the bulk 24hr endpoint costs 80 request weight
+
+
+@dataclass
+class TickerSnapshot:
+    """
+    Every symbol's price from one bulk /api/v3/ticker/price call.
+
+    `index` maps symbol -> position, and `prices` is a compact float array in
+    the same order as `symbols` (Binance's response order), so lookups are a
+    dict hit and sorting never touches the raw JSON again.
+    """
+    fetched_at: float
+    symbols: tuple[str, ...]
+    prices: array
+    raw_prices: tuple[str, ...]  # prices as Binance printed them, for display
+    index: dict[str, int] = field(repr=False)
+
+    @classmethod
+    def from_json(cls, data: list[dict], fetched_at: float | None = None) -> "TickerSnapshot":
+        symbols = tuple(item["symbol"] for item in data)
+        raw_prices = tuple(item["price"] for item in data)
+        return cls(
+            fetched_at=time.monotonic() if fetched_at is None else fetched_at,
+            symbols=symbols,
+            prices=array("d", map(float, raw_prices)),
+            raw_prices=raw_prices,
+            index={symbol: i for i, symbol in enumerate(symbols)},
+        )
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def price(self, symbol: str) -> str | None:
+        """Price of one trading pair as Binance printed it, or None if unknown."""
+        i = self.index.get(symbol.upper())
+        return None if i is None else self.raw_prices[i]
+
+
+RANK_KEYS = {
+    "quote_volume": "24h quote volume",
+    "change": "24h % change",
+    "price": "last price",
+}
+
+
+@dataclass
+class DailyStats:
+    """
+    Rolling 24h stats for every symbol from one bulk /api/v3/ticker/24hr call,
+    stored column-wise in float arrays so ranking reads plain numbers.
+    """
+    fetched_at: float
+    symbols: tuple[str, ...]
+    raw_prices: tuple[str, ...]
+    price: array
+    change: array           # priceChangePercent
+    quote_volume: array
+    index: dict[str, int] = field(repr=False)
+    _by_quote: dict[str | None, array] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_json(cls, data: list[dict], fetched_at: float | None = None) -> "DailyStats":
+        return cls(
+            fetched_at=time.monotonic() if fetched_at is None else fetched_at,
+            symbols=tuple(item["symbol"] for item in data),
+            raw_prices=tuple(item["lastPrice"] for item in data),
+            price=array("d", (float(item["lastPrice"]) for item in data)),
+            change=array("d", (float(item["priceChangePercent"]) for item in data)),
+            quote_volume=array("d", (float(item["quoteVolume"]) for item in data)),
+            index={item["symbol"]: i for i, item in enumerate(data)},
+        )
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def top(self, n: int = 10, by: str = "quote_volume", quote: str | None = "USDT") -> list[dict]:
+        """
+        The n highest symbols by `by` (a RANK_KEYS key), optionally only pairs
+        quoted in `quote`. heapq.nlargest keeps an n-sized heap: O(len * log n).
+        Pairs with no 24h volume (halted or delisted) are skipped.
+        """
+        if by not in RANK_KEYS:
+            raise ValueError(f"unknown ranking {by!r}; use one of {', '.join(RANK_KEYS)}")
+        values = getattr(self, by)
+        return [
+            {"symbol": self.symbols[i], "price": self.raw_prices[i],
+             "change": self.change[i], "quote_volume": self.quote_volume[i]}
+            for i in heapq.nlargest(n, self._candidates(quote), key=values.__getitem__)
+        ]
+
+    def _candidates(self, quote: str | None) -> array:
+        """Positions of the tradable pairs in `quote`, filtered once per snapshot."""
+        quote = quote.upper() if quote else None
+        if quote not in self._by_quote:
+            volume = self.quote_volume
+            self._by_quote[quote] = array("l", (i for i, symbol in enumerate(self.symbols)
+                                                if volume[i] > 0 and (quote is None or symbol.endswith(quote))))
+        return self._by_quote[quote]
+
+
+class TickerCache:
+    """
+    Process-wide cache of the bulk price and 24h stats snapshots, each
+    refreshed on its own TTL.
+
+    Streamlit runs each session's script in its own thread, so a refresh is
+    single-flight: the first caller to find the snapshot stale fetches it and
+    everyone else waits on the same lock and reuses the result.
+    """
+
+    def __init__(self, ttl: float = TICKER_TTL, client: BinanceClient = binance, stats_ttl: float = STATS_TTL):
+        self.ttl = ttl
+        self.stats_ttl = stats_ttl
+        self.client = client
+        self._snapshot: TickerSnapshot | None = None
+        self._daily: DailyStats | None = None
+        self._lock = threading.Lock()
+        self.upstream_calls = 0
+        self.lookups = 0
+
+    def _fresh(self) -> TickerSnapshot | None:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.age < self.ttl:
+            return snapshot
+        return None
+
+    def _fresh_daily(self) -> DailyStats | None:
+        daily = self._daily
+        if daily is not None and daily.age < self.stats_ttl:
+            return daily
+        return None
+
+    def _fetch(self, path: str):
+        self.upstream_calls += 1
+        return self.client.get_json(path)
+
+    def get(self) -> TickerSnapshot:
+        self.lookups += 1
+        snapshot = self._fresh()
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            snapshot = self._fresh()  # another thread may have refreshed while we waited
+            if snapshot is not None:
+                return snapshot
+            self._snapshot = TickerSnapshot.from_json(self._fetch("/api/v3/ticker/price"))
+            return self._snapshot
+
+    def get_daily(self) -> DailyStats:
+        self.lookups += 1
+        daily = self._fresh_daily()
+        if daily is not None:
+            return daily
+        with self._lock:
+            daily = self._fresh_daily()
+            if daily is not None:
+                return daily
+            self._daily = DailyStats.from_json(self._fetch("/api/v3/ticker/24hr"))
+            return self._daily
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot or self._daily
+        return {
+            "lookups": self.lookups,
+            "upstream_calls": self.upstream_calls,
+            "symbols": len(snapshot) if snapshot else 0,
+            "age_seconds": round(snapshot.age, 1) if snapshot else None,
+        }
+
+
+ticker_cache = TickerCache()
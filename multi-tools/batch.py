@@ -0,0 +1,120 @@
+"""
+Batch runner: push many prompts through the same agent concurrently.
+
+Input is JSONL, one prompt per line, either {"id": ..., "prompt": "..."}
+or a bare JSON string. Results are streamed as JSONL.
+
+    python batch.py prompts.jsonl --concurrency 16 --order input > results.jsonl
+    cat prompts.jsonl | python batch.py - --order completion
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from agents import Runner
+
+from http_client import close_session
+from main import agent
+
+
+def read_prompts(stream):
+    for i, line in enumerate(stream):
+        line = line.strip()
+        if not line:
+            continue
+        item = json.loads(line)
+        if isinstance(item, str):
+            item = {"prompt": item}
+        item.setdefault("id", i)
+        yield item
+
+
+async def run_one(item: dict, semaphore: asyncio.Semaphore) -> dict:
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            result = await Runner.run(agent, item["prompt"])
+            usage = result.context_wrapper.usage
+            return {
+                "id": item["id"],
+                "output": result.final_output,
+                "tokens": usage.total_tokens,
+                "latency": round(time.perf_counter() - start, 4),
+            }
+        except Exception as e:
+            return {
+                "id": item["id"],
+                "error": str(e),
+                "tokens": 0,
+                "latency": round(time.perf_counter() - start, 4),
+            }
+
+
+async def run_batch(items, out, concurrency: int = 8, order: str = "input") -> dict:
+    """
+    Run every item under a semaphore and write each result to `out` as soon
+    as it may be emitted: immediately for order="completion", or once all
+    earlier items are done for order="input". Returns throughput stats.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+
+    async def indexed(i: int, item: dict):
+        return i, await run_one(item, semaphore)
+
+    tasks = [asyncio.create_task(indexed(i, item)) for i, item in enumerate(items)]
+    done_early: dict[int, dict] = {}
+    next_index = 0
+    total_tokens = errors = 0
+
+    for finished in asyncio.as_completed(tasks):
+        i, result = await finished
+        total_tokens += result["tokens"]
+        errors += "error" in result
+
+        if order == "completion":
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            continue
+
+        # Input order: hold results until the ones before them are written
+        done_early[i] = result
+        while next_index in done_early:
+            out.write(json.dumps(done_early.pop(next_index)) + "\n")
+            next_index += 1
+        out.flush()
+
+    elapsed = time.perf_counter() - start
+    await close_session()
+    return {
+        "prompts": len(tasks),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "prompts_per_sec": round(len(tasks) / elapsed, 2) if elapsed else 0.0,
+        "tokens_per_sec": round(total_tokens / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many prompts through the multi-tools agent.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file of prompts, or - for stdin")
+    parser.add_argument("--output", default="-", help="JSONL results file, or - for stdout")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--order", choices=["input", "completion"], default="input")
+    args = parser.parse_args()
+
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    with src:
+        items = list(read_prompts(src))
+
+    stats = asyncio.run(run_batch(items, out, args.concurrency, args.order))
+    print(json.dumps(stats), file=sys.stderr)
+    if out is not sys.stdout:
+        out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Offline throughput benchmark for batch.py using the local fake model:
+
+    python bench_batch.py --prompts 500 --concurrency 1 8 32
+"""
+import argparse
+import asyncio
+import io
+import os
+
+from fake_openai import start_fake_openai
+
+PROMPTS = [
+    "convert 100 pakistani rupees to euros",
+    "what is the weather in Lahore?",
+    "convert 50 USD to PKR",
+    "how hot is it in Karachi right now?",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--prompts", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--delay", type=float, default=0.05, help="fake model latency in seconds")
+    args = parser.parse_args()
+
+    server = start_fake_openai(args.delay)
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/"
+    os.environ.setdefault("GEMINI_API_KEY", "fake")
+
+    from batch import run_batch  # import after the env points at the fake model
+
+    items = [{"id": i, "prompt": PROMPTS[i % len(PROMPTS)]} for i in range(args.prompts)]
+
+    # One event loop for every run: the shared OpenAI client's pool is bound to it
+    async def run_all():
+        for concurrency in args.concurrency:
+            for order in ("input", "completion"):
+                stats = await run_batch(items, io.StringIO(), concurrency, order)
+                print(f"concurrency={concurrency:<3} order={order:<10} "
+                      f"{stats['prompts_per_sec']:8.2f} prompts/s  {stats['tokens_per_sec']:10.2f} tokens/s  "
+                      f"errors={stats['errors']}")
+
+    asyncio.run(run_all())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
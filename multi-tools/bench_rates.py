@@ -0,0 +1,49 @@
+"""
+Upstream calls per conversion with the rate cache, against the local stub:
+
+    python bench_rates.py --conversions 1000 --burst 20
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import http_client
+from bench_tools import start_stub_server
+from rates import RateCache
+
+PAIRS = [("PKR", "EUR"), ("USD", "PKR"), ("EUR", "USD"), ("EUR", "PKR"), ("USD", "EUR")]
+
+
+async def run(url: str, conversions: int, burst: int, ttl: float):
+    cache = RateCache(ttl=ttl, url=url)
+    start = time.perf_counter()
+    for i in range(0, conversions, burst):
+        # conversions arriving together share one refresh
+        pairs = [random.choice(PAIRS) for _ in range(min(burst, conversions - i))]
+        rates = await asyncio.gather(*(cache.rate(a, b) for a, b in pairs))
+        assert all(r is not None for r in rates)
+    wall = time.perf_counter() - start
+    await http_client.close_session()
+    return cache.stats(), wall
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--conversions", type=int, default=1000)
+    parser.add_argument("--burst", type=int, default=20)
+    parser.add_argument("--ttl", type=float, default=3600)
+    parser.add_argument("--delay", type=float, default=0.02)
+    args = parser.parse_args()
+
+    server = start_stub_server(args.delay)
+    url = f"http://127.0.0.1:{server.server_port}/v4/latest"
+    stats, wall = asyncio.run(run(url, args.conversions, args.burst, args.ttl))
+    print(f"old path:   {args.conversions} upstream calls (1.00 per conversion)")
+    print(f"rate cache: {stats['upstream_calls']} upstream calls "
+          f"({stats['calls_per_conversion']:.4f} per conversion) in {wall:.2f} s")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
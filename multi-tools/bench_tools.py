@@ -0,0 +1,107 @@
+"""
+Tool latency benchmark: old `requests.get` path vs the pooled async client.
+
+Runs a local stub of the weather / exchange-rate APIs so no API keys or
+network are needed:
+
+    python bench_tools.py --calls 200 --delay 0.02
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import http_client
+
+WEATHER_BODY = json.dumps({"current": {"temp_c": 31.0, "condition": {"text": "Sunny"}}}).encode()
+RATES_BODY = json.dumps({"base": "USD", "rates": {"USD": 1.0, "EUR": 0.92, "PKR": 278.5}}).encode()
+
+
+# --- Stub Server ---
+def start_stub_server(delay: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # allow keep-alive
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(delay)  # simulated upstream work
+            body = RATES_BODY if self.path.startswith("/v4/latest") else WEATHER_BODY
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentiles(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p50 = statistics.median(ordered)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"p50={p50 * 1000:7.2f} ms  p99={p99 * 1000:7.2f} ms"
+
+
+# --- Old path: one requests.get per call, run one after another ---
+def bench_requests(url: str, calls: int) -> tuple[list[float], float]:
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        requests.get(url).json()
+        latencies.append(time.perf_counter() - t0)
+    return latencies, time.perf_counter() - start
+
+
+# --- New path: shared keep-alive session, `batch` tool calls in flight per turn ---
+async def bench_pooled(url: str, calls: int, batch: int) -> tuple[list[float], float]:
+    latencies = []
+
+    async def one_call():
+        t0 = time.perf_counter()
+        await http_client.get_json(url)
+        latencies.append(time.perf_counter() - t0)
+
+    start = time.perf_counter()
+    for i in range(0, calls, batch):
+        await asyncio.gather(*(one_call() for _ in range(min(batch, calls - i))))
+    wall = time.perf_counter() - start
+    await http_client.close_session()
+    return latencies, wall
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.02, help="stub server delay in seconds")
+    parser.add_argument("--batch", type=int, default=4, help="parallel tool calls per model turn")
+    args = parser.parse_args()
+
+    server = start_stub_server(args.delay)
+    url = f"http://127.0.0.1:{server.server_port}/v1/current.json?q=Lahore"
+
+    lat, wall = bench_requests(url, args.calls)
+    print(f"requests (sequential)    {percentiles(lat)}  wall={wall:6.2f} s")
+
+    lat, wall = asyncio.run(bench_pooled(url, args.calls, 1))
+    print(f"pooled   (sequential)    {percentiles(lat)}  wall={wall:6.2f} s")
+
+    lat, wall = asyncio.run(bench_pooled(url, args.calls, args.batch))
+    print(f"pooled   (batch of {args.batch:<3})   {percentiles(lat)}  wall={wall:6.2f} s")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
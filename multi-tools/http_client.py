@@ -0,0 +1,74 @@
+import asyncio
+import os
+
+import aiohttp
+
+# --- Pool Settings (override from .env if needed) ---
+TOTAL_CONNECTIONS = int(os.getenv("HTTP_POOL_SIZE", "100"))
+CONNECTIONS_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", "10"))
+KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE", "30"))
+
+TIMEOUT = aiohttp.ClientTimeout(
+    total=float(os.getenv("HTTP_TIMEOUT", "10")),
+    connect=float(os.getenv("HTTP_CONNECT_TIMEOUT", "3")),
+)
+
+_session: aiohttp.ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None  # the loop _session was created on
+_closing: set[asyncio.Task] = set()  # keeps stale-session close tasks alive until they finish
+
+
+def _close_stale_session():
+    """Close a session created on another event loop before it is replaced."""
+    session, loop = _session, _session_loop
+    if session is None or session.closed:
+        return
+    if loop.is_running() and not loop.is_closed():
+        # Still in use by another thread: close it there, on the loop that owns it
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+        return
+    # Its loop has finished (e.g. a previous asyncio.run that never called close_session()).
+    # Any sockets it left open can no longer be closed cleanly and Python will warn about
+    # them; close() here only marks the session and connector closed, so run it on this loop.
+    # Entry points should await close_session() before their loop ends to avoid this.
+    task = asyncio.get_running_loop().create_task(session.close())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Return the shared keep-alive session for the running event loop.
+    A new one is created if the loop changed (e.g. after asyncio.run);
+    the old one is closed first.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _close_stale_session()
+        _session_loop = loop
+        connector = aiohttp.TCPConnector(
+            limit=TOTAL_CONNECTIONS,
+            limit_per_host=CONNECTIONS_PER_HOST,
+            keepalive_timeout=KEEPALIVE_SECONDS,
+        )
+        _session = aiohttp.ClientSession(connector=connector, timeout=TIMEOUT)
+    return _session
+
+
+async def get_json(url: str, params: dict | None = None) -> dict:
+    """
+    GET a URL through the shared pool and return the decoded JSON body.
+    Can be awaited from any async @function_tool.
+    """
+    async with get_session().get(url, params=params) as response:
+        response.raise_for_status()
+        return await response.json(content_type=None)
+
+
+async def close_session():
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
@@ -1,17 +1,21 @@
-from agents import Agent, OpenAIChatCompletionsModel, Runner, function_tool, set_tracing_disabled
+from agents import Agent, ModelSettings, OpenAIChatCompletionsModel, Runner, function_tool, set_tracing_disabled
 from openai import AsyncOpenAI  
 from dotenv import load_dotenv
 import os
-import requests
+import asyncio
 
 load_dotenv()
 
+from http_client import close_session
+from rates import rate_cache
+from weather import weather_cache
+
 gemini_api_key = os.getenv("GEMINI_API_KEY")
 if not gemini_api_key:
     raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
 
 client = AsyncOpenAI(
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+    base_url=os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/"),
     api_key=gemini_api_key
 )
 
@@ -23,22 +27,19 @@ model = OpenAIChatCompletionsModel(
 set_tracing_disabled(disabled=True)  # Open AI Tracing == Disable
 
 @function_tool
-def get_weather(city:str)->str:
+async def get_weather(city:str)->str:
     """
     Get the current weather for a given city.
     """
-    result=requests.get(f"http://api.weatherapi.com/v1/current.json?key=8e3aca2b91dc4342a1162608252604&q={city}")
-    data=result.json()
+    data = await weather_cache.current(city)  # cached per normalized city
     return f"The current weather in {city} is {data['current']['temp_c']}°C with {data['current']['condition']['text']}."
 
 @function_tool
-def convert_currency(amount: float, from_currency: str, to_currency: str) -> str:
+async def convert_currency(amount: float, from_currency: str, to_currency: str) -> str:
     """
     Convert a given amount from one currency to another.
     """
-    response = requests.get(f"https://api.exchangerate-api.com/v4/latest/{from_currency.upper()}")
-    data = response.json()
-    rate = data['rates'].get(to_currency.upper())
+    rate = await rate_cache.rate(from_currency, to_currency)  # served from the cached rate table
 
     if rate:
         converted = amount * rate
@@ -50,7 +51,15 @@ agent: Agent = Agent(
     name="Weather Agent",
     instructions="You are a weather agent. You can provide weather information and forecasts.",
     model=model,
-    tools=[get_weather, convert_currency]
+    tools=[get_weather, convert_currency],
+    model_settings=ModelSettings(parallel_tool_calls=True),  # async tools run concurrently
 )
-result = Runner.run_sync(agent, "convert 100 pakistani rupees to euros")
-print(result.final_output)
\ No newline at end of file
+async def main():
+    try:
+        result = await Runner.run(agent, "convert 100 pakistani rupees to euros")
+        print(result.final_output)
+    finally:
+        await close_session()  # close the pool on this loop, before asyncio.run ends it
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import time
+
+from http_client import get_json
+
+EXCHANGE_API_URL = os.getenv("EXCHANGE_API_URL", "https://api.exchangerate-api.com/v4/latest")
+RATES_TTL = float(os.getenv("RATES_TTL", "3600"))  # upstream tables change about once a day
+PIVOT_CURRENCY = os.getenv("RATES_PIVOT", "USD")
+
+
+class RateCache:
+    """
+    In-process cache of exchange-rate tables keyed by base currency.
+
+    One table holds every rate against its base, so any FROM -> TO pair is
+    answered as a cross rate from the pivot table (rates[TO] / rates[FROM])
+    without another fetch. Concurrent callers needing the same table share
+    a single refresh.
+    """
+
+    def __init__(self, ttl: float = RATES_TTL, pivot: str = PIVOT_CURRENCY, url: str = EXCHANGE_API_URL):
+        self.ttl = ttl
+        self.pivot = pivot.upper()
+        self.url = url
+        self._tables: dict[str, tuple[float, dict]] = {}
+        self._refreshing: dict[str, asyncio.Future] = {}
+        self.upstream_calls = 0
+        self.conversions = 0
+
+    def _fresh(self, base: str) -> dict | None:
+        entry = self._tables.get(base)
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    async def get_table(self, base: str) -> dict:
+        base = base.upper()
+        rates = self._fresh(base)
+        if rates is not None:
+            return rates
+
+        # Someone is already refreshing this base: wait for their result
+        pending = self._refreshing.get(base)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._refreshing[base] = future
+        try:
+            self.upstream_calls += 1
+            data = await get_json(f"{self.url}/{base}")
+            rates = {k.upper(): float(v) for k, v in data["rates"].items()}
+            rates[base] = 1.0
+            self._tables[base] = (time.monotonic(), rates)
+            future.set_result(rates)
+            return rates
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._refreshing[base]
+
+    async def rate(self, from_currency: str, to_currency: str) -> float | None:
+        """Return the FROM -> TO rate, or None if either currency is unknown."""
+        from_currency, to_currency = from_currency.upper(), to_currency.upper()
+        self.conversions += 1
+
+        # Any already-cached table that knows both currencies will do
+        for base in [self.pivot, from_currency, *self._tables]:
+            rates = self._fresh(base)
+            if rates and from_currency in rates and to_currency in rates:
+                return rates[to_currency] / rates[from_currency]
+
+        rates = await self.get_table(self.pivot)
+        if from_currency in rates and to_currency in rates:
+            return rates[to_currency] / rates[from_currency]
+
+        # Currency missing from the pivot table: fall back to its own table
+        if from_currency != self.pivot:
+            try:
+                rates = await self.get_table(from_currency)
+            except Exception:
+                return None
+            return rates.get(to_currency)
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "conversions": self.conversions,
+            "upstream_calls": self.upstream_calls,
+            "calls_per_conversion": self.upstream_calls / self.conversions if self.conversions else 0.0,
+        }
+
+
+rate_cache = RateCache()
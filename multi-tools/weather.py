@@ -0,0 +1,123 @@
+import asyncio
+import os
+import re
+import time
+
+from http_client import get_json
+
+WEATHER_API_URL = os.getenv("WEATHER_API_URL", "http://api.weatherapi.com/v1/current.json")
+WEATHER_API_KEY = os.getenv("WEATHER_API_KEY", "8e3aca2b91dc4342a1162608252604")
+# weatherapi.com refreshes current conditions roughly every 15 minutes
+WEATHER_TTL = float(os.getenv("WEATHER_TTL", "600"))
+
+# ISO-3166 alpha-2 codes by the country names weatherapi.com returns, so that
+# "Lahore, PK" shares the entry a "Lahore" lookup filled
+COUNTRY_CODES = {
+    "afghanistan": "af", "algeria": "dz", "argentina": "ar", "australia": "au", "austria": "at",
+    "bangladesh": "bd", "belgium": "be", "brazil": "br", "bulgaria": "bg", "canada": "ca",
+    "chile": "cl", "china": "cn", "colombia": "co", "croatia": "hr", "czech republic": "cz",
+    "denmark": "dk", "egypt": "eg", "ethiopia": "et", "finland": "fi", "france": "fr",
+    "germany": "de", "ghana": "gh", "greece": "gr", "hong kong": "hk", "hungary": "hu",
+    "india": "in", "indonesia": "id", "iran": "ir", "iraq": "iq", "ireland": "ie",
+    "israel": "il", "italy": "it", "japan": "jp", "jordan": "jo", "kenya": "ke",
+    "kuwait": "kw", "malaysia": "my", "mexico": "mx", "morocco": "ma", "nepal": "np",
+    "netherlands": "nl", "new zealand": "nz", "nigeria": "ng", "norway": "no", "oman": "om",
+    "pakistan": "pk", "peru": "pe", "philippines": "ph", "poland": "pl", "portugal": "pt",
+    "qatar": "qa", "romania": "ro", "russia": "ru", "saudi arabia": "sa", "singapore": "sg",
+    "south africa": "za", "south korea": "kr", "spain": "es", "sri lanka": "lk", "sweden": "se",
+    "switzerland": "ch", "taiwan": "tw", "thailand": "th", "turkey": "tr", "ukraine": "ua",
+    "united arab emirates": "ae", "united kingdom": "gb", "united states of america": "us",
+    "vietnam": "vn",
+}
+
+
+def normalize_city(city: str) -> str:
+    """
+    Cache key for a city query: "Lahore", "lahore " and " LAHORE" all become
+    "lahore". Qualifiers are kept as they are ("London, CA" stays
+    "london, ca"), so places with the same name never share an entry.
+    """
+    parts = [re.sub(r"\s+", " ", p).strip().lower() for p in city.split(",")]
+    return ", ".join(p for p in parts if p)
+
+
+def location_keys(data: dict) -> set[str]:
+    """
+    Qualified keys for the place a response actually resolved to, e.g.
+    "london, united kingdom", "london, gb" and "london, city of london,
+    greater london". A bare "london" is never derived here: only a bare
+    query may fill it.
+    """
+    location = data.get("location") or {}
+    name = location.get("name")
+    if not name:
+        return set()
+    qualifiers = [location.get("region"), location.get("country")]
+    code = COUNTRY_CODES.get(normalize_city(qualifiers[1] or ""))
+    keys = {normalize_city(f"{name}, {q}") for q in qualifiers + [code] if q}
+    if all(qualifiers):
+        keys.add(normalize_city(f"{name}, {qualifiers[0]}, {qualifiers[1]}"))
+    return keys
+
+
+class WeatherCache:
+    """
+    TTL cache of current conditions keyed by normalized city, with
+    single-flight coalescing: concurrent lookups for the same city share
+    one upstream request. Each response is also cached under the region and
+    country it resolved to (name and ISO code), so "Lahore" followed by
+    "Lahore, PK" or "Lahore, Pakistan" is one request, while "London, CA" is
+    looked up on its own unless a Canadian London was already fetched.
+    """
+
+    def __init__(self, ttl: float = WEATHER_TTL, url: str = WEATHER_API_URL, api_key: str = WEATHER_API_KEY):
+        self.ttl = ttl
+        self.url = url
+        self.api_key = api_key
+        self._entries: dict[str, tuple[float, dict]] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def current(self, city: str) -> dict:
+        key = normalize_city(city)
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            self.hits += 1
+            return entry[1]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            # Send what the caller asked for; the key only decides what may be shared
+            data = await get_json(self.url, params={"key": self.api_key, "q": " ".join(city.split())})
+            now = time.monotonic()
+            for alias in {key} | location_keys(data):
+                self._entries[alias] = (now, data)
+            future.set_result(data)
+            return data
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+
+weather_cache = WeatherCache()
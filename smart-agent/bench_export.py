@@ -0,0 +1,50 @@
+"""
+Peak memory and time of streaming the .ics / CSV exports. Peak allocation
+must stay flat as the plan grows from one year to twenty:
+
+    python bench_export.py
+"""
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from export import iter_csv, iter_ics
+from optimizer import availability, optimize_plan
+from study_plan import generate_schedule
+
+SUBJECTS = [f"Subject {i}" for i in range(10)]
+DIFFICULTIES = (["Hard", "Medium", "Easy"] * 4)[:10]
+
+
+def stream(exporter, plan):
+    """Consume the generator the way a file writer would; return (bytes, peak bytes, seconds)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = sum(len(chunk.encode()) for chunk in exporter(plan))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, peak, elapsed
+
+
+def main():
+    print(f"{'plan':>10} {'years':>5} {'format':>6} {'output MB':>10} {'peak KB':>8} {'seconds':>8}")
+    peaks = {}
+    for years in (1, 5, 20):
+        days = 365 * years
+        even = generate_schedule(SUBJECTS, DIFFICULTIES, 4, date.today() + timedelta(days=days))
+        optimized = optimize_plan(SUBJECTS, DIFFICULTIES, availability(days, 4, 6, (6,)))
+        for name, plan in (("even", even), ("optimized", optimized)):
+            for fmt, exporter in (("ics", iter_ics), ("csv", iter_csv)):
+                size, peak, elapsed = stream(exporter, plan)
+                peaks.setdefault((name, fmt), []).append(peak)
+                print(f"{name:>10} {years:>5} {fmt:>6} {size / 1e6:>10.2f} {peak / 1024:>8.1f} {elapsed:>8.2f}")
+
+    for (name, fmt), values in peaks.items():
+        # 20x the days must not mean more than a small constant more memory
+        assert values[-1] < 2 * values[0] + 64 * 1024, f"{name} {fmt} peak grows with plan length: {values}"
+    print("peak allocation is flat in plan length")
+
+
+if __name__ == "__main__":
+    main()
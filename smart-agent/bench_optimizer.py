@@ -0,0 +1,63 @@
+"""
+Solve time, constraint checks and shortfall of the study-plan optimizer
+on synthetic workloads:
+
+    python bench_optimizer.py
+"""
+import random
+import time
+
+import numpy as np
+
+from optimizer import availability, optimize_plan
+
+WORKLOADS = [
+    # (subjects, days, rest weekdays, share of subjects with an early deadline)
+    (3, 30, (), 0.0),
+    (5, 60, (6,), 0.4),
+    (30, 365, (6,), 0.3),
+    (100, 365, (5, 6), 0.3),
+]
+
+
+def check(plan, hours, deadlines, max_daily_hours=2.0):
+    slots = plan.slots
+    capacity = np.floor(np.asarray(hours) / plan.slot_hours)
+    assert (slots >= 0).all()
+    assert (slots.sum(axis=0) <= capacity).all(), "daily capacity exceeded"
+    assert (slots <= max_daily_hours / plan.slot_hours).all(), "per-subject daily cap exceeded"
+    for s, subject in enumerate(plan.subjects):
+        if subject in deadlines:
+            assert slots[s, deadlines[subject] - 1:].sum() == 0, f"{subject} studied after its deadline"
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'subjects':>8} {'days':>5} {'solve ms':>9} {'blocks':>7} {'shortfall hrs':>14}")
+    for n_subjects, n_days, rest, early in WORKLOADS:
+        subjects = [f"Subject {i}" for i in range(n_subjects)]
+        difficulties = [rng.choice(["Easy", "Medium", "Hard"]) for _ in subjects]
+        deadlines = {s: rng.randint(n_days // 3, n_days) for s in subjects if rng.random() < early}
+        hours = availability(n_days, 4, 6, rest)
+
+        t0 = time.perf_counter()
+        plan = optimize_plan(subjects, difficulties, hours, deadlines)
+        elapsed = (time.perf_counter() - t0) * 1000
+
+        check(plan, hours, deadlines)
+        shortfall = sum(plan.shortfall_hours.values())
+        print(f"{n_subjects:>8} {n_days:>5} {elapsed:>9.1f} {len(plan.blocks()):>7} {shortfall:>14g}")
+    print("all constraints hold")
+
+    # Shortfall is measured against the uncapped difficulty share
+    plan = optimize_plan(["Math", "Physics"], ["Hard", "Hard"], [4.0] * 30, {"Math": 2})
+    assert plan.shortfall_hours == {"Math": 58.0}, plan.shortfall_hours
+    plan = optimize_plan(["Math", "Physics"], ["Hard", "Hard"], [4.0] * 30, {"Math": 0})
+    assert plan.shortfall_hours == {"Math": 60.0}, plan.shortfall_hours
+    plan = optimize_plan(["Math"], ["Hard"], [4.0] * 30)
+    assert plan.slots.sum() * plan.slot_hours == 120 and not plan.shortfall_hours
+    print("deadline shortfalls reported, single subject uses every free hour")
+
+
+if __name__ == "__main__":
+    main()
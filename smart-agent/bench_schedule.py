@@ -0,0 +1,99 @@
+"""
+Generation and render time of the compact StudyPlan vs the old per-day list:
+
+    python bench_schedule.py --days 365 --subjects 30
+"""
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+from streamlit.testing.v1 import AppTest
+
+from study_plan import generate_schedule
+
+
+def legacy_generate_schedule(subjects_list, diff_list, hours_per_day, exam_date):
+    """The original implementation, kept here for comparison."""
+    total_days = (exam_date - datetime.today().date()).days
+    schedule = []
+    weights = {"Easy": 1, "Medium": 2, "Hard": 3}
+    weight_list = [weights.get(d.strip().capitalize(), 2) for d in diff_list]
+    total_weight = sum(weight_list)
+    total_hours = hours_per_day * total_days
+    subject_hours = [(subjects_list[i], round((weight_list[i]/total_weight) * total_hours, 1)) for i in range(len(subjects_list))]
+    for day in range(1, total_days + 1):
+        today = datetime.today().date() + timedelta(days=day)
+        day_plan = {"day": day, "date": today, "tasks": [], "breaks": "🧘 Breaks every 45 mins"}
+        for subject, hrs in subject_hours:
+            per_day = round(hrs / total_days, 2)
+            if per_day > 0:
+                day_plan["tasks"].append(f"{subject}: {per_day} hrs")
+        schedule.append(day_plan)
+    return schedule
+
+
+def render_legacy(days, subjects):
+    import streamlit as st
+    from datetime import date, timedelta
+    from bench_schedule import legacy_generate_schedule
+    names = [f"Subject {i}" for i in range(subjects)]
+    output = legacy_generate_schedule(names, ["Hard", "Medium", "Easy"] * (subjects // 3 + 1), 4,
+                                      date.today() + timedelta(days=days))
+    for day in output:
+        with st.expander(f"📆 Day {day['day']} – {day['date']}"):
+            for task in day["tasks"]:
+                st.markdown(f"- {task}")
+            st.markdown(day["breaks"])
+
+
+def render_compact(days, subjects):
+    import streamlit as st
+    from datetime import date, timedelta
+    from study_plan import generate_schedule
+    names = [f"Subject {i}" for i in range(subjects)]
+    plan = generate_schedule(names, ["Hard", "Medium", "Easy"] * (subjects // 3 + 1), 4,
+                             date.today() + timedelta(days=days))
+    for first, last, tasks in plan.blocks():
+        st.markdown(f"**Days {first}–{last}**: every day")
+        for task in tasks:
+            st.markdown(f"- {task}")
+    for day in plan.week(1):
+        with st.expander(f"📆 Day {day['day']} – {day['date']}"):
+            for task in day["tasks"]:
+                st.markdown(f"- {task}")
+            st.markdown(day["breaks"])
+
+
+def timed(fn, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) / runs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--subjects", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    subjects = [f"Subject {i}" for i in range(args.subjects)]
+    difficulties = (["Hard", "Medium", "Easy"] * args.subjects)[:args.subjects]
+    exam = date.today() + timedelta(days=args.days)
+
+    old = timed(lambda: legacy_generate_schedule(subjects, difficulties, 4, exam), args.runs)
+    new = timed(lambda: generate_schedule(subjects, difficulties, 4, exam), args.runs)
+    print(f"generate  old={old * 1000:8.2f} ms  new={new * 1000:8.4f} ms")
+
+    for label, script in (("old", render_legacy), ("new", render_compact)):
+        app = AppTest.from_function(script, args=(args.days, args.subjects), default_timeout=120)
+        start = time.perf_counter()
+        app.run()
+        elapsed = time.perf_counter() - start
+        print(f"render {label}  {elapsed * 1000:8.1f} ms  expanders={len(app.expander)}  "
+              f"markdown elements={len(app.markdown)}")
+
+
+if __name__ == "__main__":
+    main()
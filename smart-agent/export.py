@@ -0,0 +1,98 @@
+"""
+Calendar and spreadsheet exports. Both exporters are generators that build
+one day at a time from the plan, so writing a multi-year plan to a file or
+socket takes constant memory. st.download_button needs the whole payload,
+though: ics_bytes/csv_bytes join it, and that download is O(plan length).
+"""
+import csv
+import io
+from datetime import datetime, time, timedelta, timezone
+
+DAY_START = time(9, 0)  # first study session of each day
+
+
+def _sessions(plan):
+    """(date, [(subject, hours, start, end)]) for every day, study sessions back to back from DAY_START."""
+    for n in range(1, plan.total_days + 1):
+        day = plan.start + timedelta(days=n - 1)
+        cursor = datetime.combine(day, DAY_START)
+        rows = []
+        for subject, hours in plan.sessions(n):
+            end = cursor + timedelta(minutes=round(hours * 60))
+            rows.append((subject, hours, cursor, end))
+            cursor = end
+        yield n, day, rows
+
+
+# --- CSV ---
+CSV_HEADER = ["day", "date", "subject", "hours", "start", "end"]
+
+
+def iter_csv(plan):
+    """Yield the plan as CSV text, one chunk per day."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADER)
+    for n, day, rows in _sessions(plan):
+        for subject, hours, start, end in rows:
+            writer.writerow([n, day.isoformat(), subject, f"{hours:g}", start.strftime("%H:%M"), end.strftime("%H:%M")])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+# --- iCalendar (RFC 5545) ---
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _fold(line: str) -> str:
+    """Lines longer than 75 octets continue on the next line after a space."""
+    data = line.encode()
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts, start = [], 0
+    while start < len(data):
+        end = min(start + (75 if start == 0 else 74), len(data))
+        while end < len(data) and (data[end] & 0xC0) == 0x80:  # don't split a UTF-8 character
+            end -= 1
+        parts.append(data[start:end].decode())
+        start = end
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def iter_ics(plan, calendar_name: str = "Smart Study Plan"):
+    """Yield the plan as an .ics calendar, one VEVENT per study session (floating local time)."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    uid_base = f"{plan.start:%Y%m%d}-{plan.total_days}-{stamp}"
+    yield "".join(_fold(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//smart-agent//Study Plan//EN",
+        "CALSCALE:GREGORIAN",
+        f"X-WR-CALNAME:{_escape(calendar_name)}",
+    ))
+    for n, day, rows in _sessions(plan):
+        lines = []
+        for i, (subject, hours, start, end) in enumerate(rows):
+            lines += [
+                "BEGIN:VEVENT",
+                f"UID:{uid_base}-{n}-{i}@smart-agent",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART:{start:%Y%m%dT%H%M%S}",
+                f"DTEND:{end:%Y%m%dT%H%M%S}",
+                f"SUMMARY:{_escape(f'📚 {subject}')}",
+                f"DESCRIPTION:{_escape(f'Day {n}: {hours:g} hrs. {plan.breaks}')}",
+                "END:VEVENT",
+            ]
+        yield "".join(_fold(line) for line in lines)
+    yield "END:VCALENDAR\r\n"
+
+
+def ics_bytes(plan) -> bytes:
+    """Whole calendar for st.download_button, built only when the button is clicked (size grows with the plan)."""
+    return "".join(iter_ics(plan)).encode()
+
+
+def csv_bytes(plan) -> bytes:
+    return "".join(iter_csv(plan)).encode()
@@ -1,7 +1,10 @@
 import streamlit as st
 import os
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
+from datetime import date
+from study_plan import generate_schedule
+from optimizer import availability, optimize_plan
+from export import csv_bytes, ics_bytes
 
 # --- Load API Key (Optional for future AI integration) ---
 load_dotenv()
@@ -71,36 +74,28 @@ difficulties = st.text_input("⚖️ Enter difficulty levels (in order: Easy, Me
 hours_per_day = st.number_input("⏱️ Available study hours per day", min_value=1, max_value=24, value=4)
 exam_date = st.date_input("🗓️ Exam date")
 
-# --- Schedule Generator Logic ---
-def generate_schedule(subjects_list, diff_list, hours_per_day, exam_date):
-    total_days = (exam_date - datetime.today().date()).days
-    schedule = []
-
-    if total_days <= 0:
-        return ["⛔ Exam date must be in the future."]
-
-    weights = {"Easy": 1, "Medium": 2, "Hard": 3}
-    weight_list = [weights.get(d.strip().capitalize(), 2) for d in diff_list]
-    total_weight = sum(weight_list)
-    total_hours = hours_per_day * total_days
-
-    subject_hours = [(subjects_list[i], round((weight_list[i]/total_weight) * total_hours, 1)) for i in range(len(subjects_list))]
-
-    for day in range(1, total_days + 1):
-        today = datetime.today().date() + timedelta(days=day)
-        day_plan = {
-            "day": day,
-            "date": today,
-            "tasks": [],
-            "breaks": "🧘 Breaks every 45 mins"
-        }
-        for subject, hrs in subject_hours:
-            per_day = round(hrs / total_days, 2)
-            if per_day > 0:
-                day_plan["tasks"].append(f"{subject}: {per_day} hrs")
-        schedule.append(day_plan)
-
-    return schedule
+# --- Optimizer Options ---
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+optimized = st.toggle("🧠 Optimize around rest days, weekends and subject deadlines", value=False)
+if optimized:
+    weekend_hours = st.number_input("🏖️ Available study hours on weekends", min_value=0, max_value=24, value=int(hours_per_day))
+    rest_days = st.multiselect("🛌 Rest days", WEEKDAYS)
+    max_daily_hours = st.number_input("⏳ Max hours per subject per day (ignored for a single subject)",
+                                      min_value=0.5, max_value=24.0, value=2.0, step=0.5)
+    deadlines_text = st.text_input("⏰ Subject deadlines (optional)", placeholder="e.g., Math=2025-12-01, Physics=2025-12-10")
+
+def parse_deadlines(text, subject_list):
+    """'Math=2025-12-01, ...' -> {subject: day number}; the subject must be finished before that day."""
+    deadlines = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, when = part.partition("=")
+        name = name.strip()
+        if name not in subject_list:
+            raise ValueError(f"Unknown subject in deadlines: {name}")
+        deadlines[name] = (date.fromisoformat(when.strip()) - date.today()).days
+    return deadlines
+
 
 # --- Generate Button and Output ---
 if st.button("📅 Generate Study Plan") and subjects.strip() and difficulties.strip():
@@ -110,18 +105,57 @@ if st.button("📅 Generate Study Plan") and subjects.strip() and difficulties.s
 
         if len(subject_list) != len(diff_list):
             st.error("❌ Number of subjects and difficulty levels must match.")
+            st.session_state.pop("plan", None)
+        elif optimized:
+            total_days = (exam_date - date.today()).days
+            try:
+                deadlines = parse_deadlines(deadlines_text, subject_list)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                deadlines = None
+            if total_days <= 0:
+                st.error("⛔ Exam date must be in the future.")
+                st.session_state.pop("plan", None)
+            elif deadlines is not None:
+                hours = availability(total_days, hours_per_day, weekend_hours,
+                                     [WEEKDAYS.index(d) for d in rest_days])
+                plan = optimize_plan(subject_list, diff_list, hours, deadlines, max_daily_hours=max_daily_hours)
+                st.session_state["plan"] = plan
+                for subject, missing in plan.shortfall_hours.items():
+                    reason = "its deadline leaves" if subject in deadlines else "the per-subject daily limit leaves"
+                    st.warning(f"⚠️ {subject} is {missing:g} hrs short of its share: {reason} too little time.")
         else:
             output = generate_schedule(subject_list, diff_list, hours_per_day, exam_date)
 
             if isinstance(output, str):
                 st.error(output)
+                st.session_state.pop("plan", None)
             else:
-                st.markdown("### ✅ Your Smart Study Plan")
-                for day in output:
-                    with st.expander(f"📆 Day {day['day']} – {day['date']}"):
-                        for task in day["tasks"]:
-                            st.markdown(f"- {task}")
-                        st.markdown(f"🧘 {day['breaks']}")
+                st.session_state["plan"] = output
+
+# The plan is kept in session state so paging through weeks doesn't regenerate it
+plan = st.session_state.get("plan")
+if plan is not None:
+    st.markdown("### ✅ Your Smart Study Plan")
+
+    # Files are streamed from the plan only when a button is clicked, not on every rerun
+    col1, col2 = st.columns(2)
+    col1.download_button("📆 Add to calendar (.ics)", data=lambda: ics_bytes(plan), file_name="study_plan.ics",
+                         mime="text/calendar", on_click="ignore")
+    col2.download_button("📊 Download CSV", data=lambda: csv_bytes(plan), file_name="study_plan.csv",
+                         mime="text/csv", on_click="ignore")
+    blocks = plan.blocks()
+    for first, last, tasks in blocks if len(blocks) <= 5 else []:
+        st.markdown(f"**Days {first}–{last}** ({plan.day(first)['date']} → {plan.day(last)['date']}): every day")
+        for task in tasks:
+            st.markdown(f"- {task}")
+
+    week = st.number_input(f"🗓️ Week (1–{plan.total_weeks})", min_value=1, max_value=plan.total_weeks, value=1)
+    for day in plan.week(week):
+        with st.expander(f"📆 Day {day['day']} – {day['date']}"):
+            for task in day["tasks"]:
+                st.markdown(f"- {task}")
+            st.markdown(day["breaks"])
 
 # --- Footer ---
 st.markdown("---")
@@ -0,0 +1,258 @@
+"""
+Constraint-based study-plan optimizer.
+
+Time is split into slots (30 minutes by default) and x[s, d] is the number
+of slots of subject s on day d. The plan must respect:
+
+- per-day availability: sum_s x[s, d] <= capacity[d] (0 on rest days)
+- per-subject deadlines: x[s, d] = 0 on and after the subject's deadline day
+- no cramming: x[s, d] <= max_daily_slots (when there is more than one subject)
+- demand: sum_d x[s, d] = the subject's share of the available time, by difficulty
+
+and it minimizes sum (x - target)^2, where target spreads each subject over
+its window in proportion to the hours available each day, with a ramp
+towards the end of the window so material is revisited before the exam
+(spaced repetition). A greedy earliest-deadline-first pass builds a
+feasible integer plan and a local search then moves slots between days.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+
+from study_plan import BREAKS, WEIGHTS
+
+SLOT_HOURS = 0.5
+
+
+@dataclass
+class OptimizedPlan:
+    start: date                 # date of day 1
+    subjects: list[str]
+    slots: np.ndarray           # (subjects, days) integer slot counts
+    demand: np.ndarray          # slots each subject is scheduled for (share capped by deadline and daily limit)
+    share: np.ndarray           # slots each subject's difficulty share asks for, before any cap
+    slot_hours: float = SLOT_HOURS
+    breaks: str = BREAKS
+
+    @property
+    def total_days(self) -> int:
+        return self.slots.shape[1]
+
+    @property
+    def total_weeks(self) -> int:
+        return (self.total_days + 6) // 7
+
+    @property
+    def shortfall_hours(self) -> dict[str, float]:
+        """Hours of its difficulty share a subject could not get because of deadlines or the daily limit."""
+        missing = self.share - self.slots.sum(axis=1)
+        return {s: float(m) * self.slot_hours for s, m in zip(self.subjects, missing) if m > 0}
+
+    def _tasks(self, d: int) -> list[str]:
+        column = self.slots[:, d]
+        return [f"{self.subjects[s]}: {column[s] * self.slot_hours:g} hrs" for s in np.flatnonzero(column)]
+
+    def sessions(self, n: int) -> list[tuple[str, float]]:
+        """(subject, hours) studied on day n (1-based)."""
+        column = self.slots[:, n - 1]
+        return [(self.subjects[s], float(column[s]) * self.slot_hours) for s in np.flatnonzero(column)]
+
+    def day(self, n: int) -> dict:
+        tasks = self._tasks(n - 1)
+        return {"day": n, "date": self.start + timedelta(days=n - 1),
+                "tasks": tasks or ["🛌 Rest day"], "breaks": self.breaks}
+
+    def days(self, first: int = 1, last: int | None = None):
+        last = self.total_days if last is None else min(last, self.total_days)
+        for n in range(first, last + 1):
+            yield self.day(n)
+
+    def week(self, w: int) -> list[dict]:
+        return list(self.days(7 * (w - 1) + 1, 7 * w))
+
+    def blocks(self) -> list[tuple[int, int, list[str]]]:
+        """Run-length encode identical consecutive days as (first_day, last_day, tasks)."""
+        if self.total_days == 0:
+            return []
+        changes = np.flatnonzero(np.any(self.slots[:, 1:] != self.slots[:, :-1], axis=0)) + 1
+        starts = np.concatenate(([0], changes))
+        ends = np.concatenate((changes, [self.total_days]))
+        return [(int(a) + 1, int(b), self._tasks(a) or ["🛌 Rest day"]) for a, b in zip(starts, ends)]
+
+
+def _targets(capacity, demand, windows, review_boost):
+    """Ideal fractional spread of each subject over its window."""
+    n_days = len(capacity)
+    day_index = np.arange(n_days)
+    target = np.zeros((len(demand), n_days))
+    for s, window in enumerate(windows):
+        if window == 0 or demand[s] == 0:
+            continue
+        shape = capacity[:window] * (1.0 + review_boost * day_index[:window] / max(window - 1, 1))
+        if shape.sum() > 0:
+            target[s, :window] = demand[s] * shape / shape.sum()
+    return target
+
+
+def _greedy(capacity, demand, windows, target, max_daily):
+    """Earliest-deadline-first rounding of the targets into a feasible integer plan."""
+    slots = np.zeros(target.shape, dtype=np.int64)
+    remaining = capacity.astype(np.int64).copy()
+    for s in np.argsort(windows, kind="stable"):
+        window = windows[s]
+        if window == 0 or demand[s] == 0:
+            continue
+        room = np.minimum(remaining[:window], max_daily)
+        want = np.minimum(np.floor(target[s, :window]).astype(np.int64), room)
+        # Hand out what's left one slot at a time, to the days with the largest unmet target
+        left = demand[s] - want.sum()
+        if left > 0:
+            gap = np.where(room > want, target[s, :window] - want, -np.inf)
+            for d in np.argsort(-gap, kind="stable"):
+                if left == 0 or gap[d] == -np.inf:
+                    break
+                take = min(left, room[d] - want[d])
+                want[d] += take
+                left -= take
+        slots[s, :window] = want
+        remaining[:window] -= want
+
+    return _fill(slots, capacity, demand, windows, target, max_daily)
+
+
+def _fill(slots, capacity, demand, windows, target, max_daily):
+    """Subjects still short of their demand take any free capacity left in their window."""
+    remaining = capacity - slots.sum(axis=0)
+    for s in np.flatnonzero(slots.sum(axis=1) < demand):
+        window = windows[s]
+        left = demand[s] - slots[s].sum()
+        room = np.minimum(remaining[:window], max_daily - slots[s, :window])
+        for d in np.argsort(-(target[s, :window] - slots[s, :window]), kind="stable"):
+            if left == 0:
+                break
+            take = min(left, room[d])
+            if take > 0:
+                slots[s, d] += take
+                remaining[d] -= take
+                left -= take
+
+        # Still short: free a full day by moving another subject's slot to a day with spare room
+        while left > 0:
+            moved = False
+            for d in np.flatnonzero((remaining[:window] == 0) & (slots[s, :window] < max_daily)):
+                for b in np.flatnonzero(slots[:, d] > 0):
+                    if b == s:
+                        continue
+                    spare = np.flatnonzero((remaining[:windows[b]] > 0) & (slots[b, :windows[b]] < max_daily))
+                    if len(spare) == 0:
+                        continue
+                    f = spare[np.argmax(target[b, spare] - slots[b, spare])]
+                    slots[b, d] -= 1
+                    slots[b, f] += 1
+                    remaining[f] -= 1
+                    slots[s, d] += 1
+                    left -= 1
+                    moved = True
+                    break
+                if moved:
+                    break
+            if not moved:
+                break
+    return slots
+
+
+def _local_search(slots, capacity, windows, target, max_daily, max_sweeps):
+    """
+    Move single slots to reduce sum (x - target)^2. For each subject, try
+    moving one slot from its most over-served day to its most under-served
+    day; when that day is full, swap with the subject that benefits most
+    from moving the other way.
+    """
+    free = capacity - slots.sum(axis=0)
+    n_subjects = slots.shape[0]
+    for _ in range(max_sweeps):
+        improved = False
+        residual = slots - target
+        for s in range(n_subjects):
+            window = windows[s]
+            if window < 2:
+                continue
+            r = residual[s, :window]
+            i = int(np.argmax(np.where(slots[s, :window] > 0, r, -np.inf)))
+            j = int(np.argmin(np.where(slots[s, :window] < max_daily, r, np.inf)))
+            gain = 2 * (r[j] - r[i]) + 2  # change in sum of squares for subject s
+            if i == j or gain >= 0:
+                continue
+            if free[j] > 0:
+                slots[s, i] -= 1
+                slots[s, j] += 1
+                free[i] += 1
+                free[j] -= 1
+            else:
+                # Swap with another subject b: one slot of b moves from day j to day i
+                rb = residual[:, i] - residual[:, j]
+                ok = (slots[:, j] > 0) & (slots[:, i] < max_daily) & (windows > i)
+                ok[s] = False
+                if not ok.any():
+                    continue
+                b_gain = np.where(ok, 2 * rb + 2, np.inf)
+                b = int(np.argmin(b_gain))
+                if gain + b_gain[b] >= 0:
+                    continue
+                slots[s, i] -= 1
+                slots[s, j] += 1
+                slots[b, j] -= 1
+                slots[b, i] += 1
+                residual[b] = slots[b] - target[b]
+            residual[s] = slots[s] - target[s]
+            improved = True
+        if not improved:
+            break
+    return slots
+
+
+def optimize_plan(subjects, difficulties, available_hours, deadlines=None, start: date | None = None,
+                  slot_hours: float = SLOT_HOURS, max_daily_hours: float = 2.0,
+                  review_boost: float = 0.5, max_sweeps: int = 50) -> OptimizedPlan:
+    """
+    subjects / difficulties: parallel lists ("Easy", "Medium", "Hard").
+    available_hours: hours free on each day, day 1 first; use 0 for rest days.
+    deadlines: optional {subject: day number}; the subject must be finished before that day.
+    max_daily_hours: most hours one subject gets on a day; not applied to a single subject,
+    which has nothing to be balanced against.
+    """
+    start = start or date.today() + timedelta(days=1)
+    deadlines = deadlines or {}
+    n_days = len(available_hours)
+
+    capacity = np.floor(np.asarray(available_hours, dtype=float) / slot_hours).astype(np.int64)
+    weights = np.array([WEIGHTS.get(d.strip().capitalize(), 2) for d in difficulties], dtype=float)
+    windows = np.array([min(max(int(deadlines.get(s, n_days + 1)) - 1, 0), n_days) for s in subjects])
+    max_daily = max(1, int(max_daily_hours / slot_hours)) if len(subjects) > 1 else int(capacity.max(initial=1))
+
+    # Share of total time by difficulty, capped by what each window can physically hold
+    total = capacity.sum()
+    share = np.floor(weights / weights.sum() * total).astype(np.int64) if len(subjects) else np.zeros(0, np.int64)
+    cap_in_window = np.array([np.minimum(capacity[:w], max_daily).sum() for w in windows], dtype=np.int64)
+    demand = np.minimum(share, cap_in_window)
+
+    target = _targets(capacity, demand, windows, review_boost)
+    slots = _greedy(capacity, demand, windows, target, max_daily)
+    slots = _local_search(slots, capacity, windows, target, max_daily, max_sweeps)
+    slots = _fill(slots, capacity, demand, windows, target, max_daily)  # local moves may free up room
+    return OptimizedPlan(start=start, subjects=list(subjects), slots=slots, demand=demand, share=share,
+                         slot_hours=slot_hours)
+
+
+def availability(total_days: int, weekday_hours: float, weekend_hours: float, rest_weekdays=(), start: date | None = None):
+    """Per-day available hours for a plan starting at `start`; rest_weekdays uses 0=Monday."""
+    start = start or date.today() + timedelta(days=1)
+    hours = []
+    for n in range(total_days):
+        weekday = (start + timedelta(days=n)).weekday()
+        if weekday in rest_weekdays:
+            hours.append(0.0)
+        else:
+            hours.append(weekend_hours if weekday >= 5 else weekday_hours)
+    return hours
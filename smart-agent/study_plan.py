@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+WEIGHTS = {"Easy": 1, "Medium": 2, "Hard": 3}
+BREAKS = "🧘 Breaks every 45 mins"
+
+
+@dataclass(frozen=True)
+class StudyPlan:
+    """
+    Compact study schedule: the per-subject daily allocation is computed once
+    and days are expanded only when asked for, so a year-long plan costs the
+    same to build as a one-week plan.
+    """
+    start: date                               # date of day 1
+    total_days: int
+    allocations: tuple[tuple[str, float], ...]  # (subject, hours per day)
+    breaks: str = BREAKS
+
+    @property
+    def tasks(self) -> list[str]:
+        return [f"{subject}: {per_day} hrs" for subject, per_day in self.allocations if per_day > 0]
+
+    def sessions(self, n: int) -> list[tuple[str, float]]:
+        """(subject, hours) studied on day n; the same every day for an even split."""
+        return [(subject, per_day) for subject, per_day in self.allocations if per_day > 0]
+
+    def day(self, n: int) -> dict:
+        """Expand day n (1-based) into the same dict the old list-based schedule held."""
+        if not 1 <= n <= self.total_days:
+            raise IndexError(n)
+        return {"day": n, "date": self.start + timedelta(days=n - 1), "tasks": self.tasks, "breaks": self.breaks}
+
+    def days(self, first: int = 1, last: int | None = None):
+        last = self.total_days if last is None else min(last, self.total_days)
+        tasks = self.tasks
+        for n in range(first, last + 1):
+            yield {"day": n, "date": self.start + timedelta(days=n - 1), "tasks": tasks, "breaks": self.breaks}
+
+    def blocks(self) -> list[tuple[int, int, list[str]]]:
+        """Run-length-encoded view: (first_day, last_day, tasks) for each run of identical days."""
+        return [(1, self.total_days, self.tasks)] if self.total_days > 0 else []
+
+    @property
+    def total_weeks(self) -> int:
+        return (self.total_days + 6) // 7
+
+    def week(self, w: int) -> list[dict]:
+        """Days of week w (1-based)."""
+        return list(self.days(7 * (w - 1) + 1, 7 * w))
+
+
+def generate_schedule(subjects_list, diff_list, hours_per_day, exam_date, today: date | None = None):
+    today = today or date.today()
+    total_days = (exam_date - today).days
+    if total_days <= 0:
+        return "⛔ Exam date must be in the future."
+
+    weight_list = [WEIGHTS.get(d.strip().capitalize(), 2) for d in diff_list]
+    total_weight = sum(weight_list)
+    total_hours = hours_per_day * total_days
+
+    # Same rounding as the original per-day loop, done once per subject
+    allocations = tuple(
+        (subject, round(round((weight / total_weight) * total_hours, 1) / total_days, 2))
+        for subject, weight in zip(subjects_list, weight_list)
+    )
+    return StudyPlan(start=today + timedelta(days=1), total_days=total_days, allocations=allocations)